@@ -227,6 +227,31 @@ def add_algo3d_arg(parser: argparse.ArgumentParser, choices: list, default: str
     )
 
 
+def add_threads_arg(parser: argparse.ArgumentParser) -> None:
+    """
+    Add Gmsh thread count argument to an ArgumentParser.
+
+    Adds:
+        --threads: Number of threads used by Gmsh (default: None, keep Gmsh settings)
+
+    Args:
+        parser: ArgumentParser instance to add arguments to
+
+    Example:
+        >>> parser = argparse.ArgumentParser()
+        >>> add_threads_arg(parser)
+        >>> args = parser.parse_args(['--threads', '4'])
+        >>> args.threads
+        4
+    """
+    parser.add_argument(
+        "--threads",
+        help="number of threads used by gmsh (default: keep gmsh settings)",
+        type=int,
+        default=None,
+    )
+
+
 def add_mesh_args(parser: argparse.ArgumentParser, 
                   algo2d_choices: Optional[list] = None, 
                   algo3d_choices: Optional[list] = None,
@@ -1,3 +1,5 @@
+import gmsh
+
 # Load Modules for geometrical Objects
 from python_magnetgeo.Insert import Insert
 from python_magnetgeo.MSite import MSite
@@ -36,8 +38,6 @@ def gmsh_air(Object: ObjectType, AirData: tuple) -> tuple:
 
 
 def gmsh_boundingbox(name: str) -> tuple:
-    import gmsh
-
     x0 = []
     y0 = []
     z0 = []
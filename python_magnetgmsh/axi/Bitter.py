@@ -3,14 +3,39 @@
 
 import re
 import gmsh
+import numpy as np
 from python_magnetgeo.Bitter import Bitter
-from ..mesh.bcs import create_bcs
+from ..mesh.bcs import create_bcs_batch
+from .Air import gmsh_air
 
-from ..utils.lists import flatten
 from ..logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# strip section suffix from physical names
+_SECTION_RE = re.compile(r"_S\d+")
+
+
+def split_by_dim(entries: list) -> tuple:
+    """
+    split a fragment/cut output entry into surfaces (dim=2) and curves (dim=1) tags
+    """
+    _ids = []
+    _cracks = []
+    for dim, tag in entries:
+        if dim == 2:
+            _ids.append(tag)
+        elif dim == 1:
+            _cracks.append(tag)
+    return (_ids, _cracks)
+
+
+def slits_eps(Bitter: Bitter) -> list:
+    """
+    get equivalent thickness of each cooling slit (computed once per call site)
+    """
+    return [Bitter.equivalent_eps(i) for i in range(len(Bitter.coolingslits or []))]
+
 
 def gmsh_box(Bitter: Bitter, debug: bool = False) -> list:
     """
@@ -23,121 +48,151 @@ def gmsh_box(Bitter: Bitter, debug: bool = False) -> list:
     z0 = Bitter.z[1]
     z1 = Bitter.z[0]
     boxes = []
-    for i, slit in enumerate(Bitter.coolingslits):
+    for slit, eps in zip(Bitter.coolingslits, slits_eps(Bitter)):
         x = float(slit.r)
-        eps = Bitter.equivalent_eps(i)
         xmin = x - eps / 2.0
         xmax = x + eps / 2.0
         boxes.append(([xmin, z0, 0, xmax, z1, 0], eps / 2.0))
 
-    print("gmsh_box(Bitter):")
-    for box in boxes:
-        print(box)
+    if debug:
+        print("gmsh_box(Bitter):")
+        for box in boxes:
+            print(box)
     return boxes
 
 
-def gmsh_ids(Bitter: Bitter, AirData: tuple, thickslit: bool = False, debug: bool = False) -> tuple:
+def gmsh_sections(Bitter: Bitter) -> list:
     """
-    create gmsh geometry
-
-    thickslit: boolean, True for Thickslit else False
-
+    create HP, sections and BP rectangles
     """
-    print(f"gmsh_ids: Bitter={Bitter.name}, thickslit={thickslit}")
 
-    gmsh_ids = []
-    gmsh_cracks = []
-
-    coolingslit = False
-    if Bitter.coolingslits is not None:
-        coolingslit = True
+    _addRect = gmsh.model.occ.addRectangle
 
     x = Bitter.r[0]
     dr = Bitter.r[1] - Bitter.r[0]
     y = -Bitter.modelaxi.h
-    # print("y=", y)
     tol = 1e-10
 
+    gmsh_ids = []
+
     # HP
-    if abs(y - Bitter.z[0]) >= tol:
-        _id = gmsh.model.occ.addRectangle(x, Bitter.z[0], 0, dr, abs(y - Bitter.z[0]))
+    # Bitter.z[0] <= y <= Bitter.z[1] by construction
+    if y - Bitter.z[0] >= tol:
+        _id = _addRect(x, Bitter.z[0], 0, dr, y - Bitter.z[0])
         gmsh_ids.append(_id)
 
-    # Sections
-    for i, (n, pitch) in enumerate(zip(Bitter.modelaxi.turns, Bitter.modelaxi.pitch)):
-        dz = n * pitch
-        _id = gmsh.model.occ.addRectangle(x, y, 0, dr, dz)
-        gmsh_ids.append(_id)
-        y += dz
-        # print("(n=", n, " pitch=", pitch, ")dz=", dz, " gmsh_ids=", gmsh_ids, " y=", y)
+    # Sections: precompute all (y, dz) at once
+    dzs = np.asarray(Bitter.modelaxi.turns, dtype=float) * np.asarray(
+        Bitter.modelaxi.pitch, dtype=float
+    )
+    ys = y + np.concatenate(([0.0], np.cumsum(dzs)[:-1]))
+    gmsh_ids += [_addRect(x, yi, 0, dr, dzi) for yi, dzi in zip(ys.tolist(), dzs.tolist())]
+    if dzs.size:
+        y = float(ys[-1] + dzs[-1])
 
     # BP
-    if abs(y - Bitter.z[1]) >= tol:
-        # print("abs(y - Bitter.z[1])=", abs(y - Bitter.z[1]))
-        _id = gmsh.model.occ.addRectangle(x, y, 0, dr, abs(y - Bitter.z[1]))
+    if Bitter.z[1] - y >= tol:
+        _id = _addRect(x, y, 0, dr, Bitter.z[1] - y)
         gmsh_ids.append(_id)
-    gmsh.model.occ.synchronize()
 
-    # Cooling Channels
-    if coolingslit:
-        m = None
-        ngmsh_ids = []
-        ngmsh_cracks = []
+    return gmsh_ids
+
+
+def gmsh_thin_slits(Bitter: Bitter, domain: list, debug: bool = False) -> tuple:
+    """
+    fragment sections with a crack line per cooling slit
+    """
+
+    _addPoint = gmsh.model.occ.addPoint
+    _addLine = gmsh.model.occ.addLine
+
+    z0, z1 = Bitter.z[0], Bitter.z[1]
+    xs = [float(slit.r) for slit in Bitter.coolingslits]
+    pt1s = [_addPoint(x, z0, 0) for x in xs]
+    pt2s = [_addPoint(x, z1, 0) for x in xs]
+    gmsh_cracks = [_addLine(pt1, pt2) for pt1, pt2 in zip(pt1s, pt2s)]
+
+    cuts = [(1, i) for i in gmsh_cracks]
+    o, m = gmsh.model.occ.fragment(domain, cuts)
+    return ([], m)
+
+
+def gmsh_thick_slits(Bitter: Bitter, domain: list, debug: bool = False) -> tuple:
+    """
+    cut sections with an annular ring per cooling slit
+    """
+
+    _addRect = gmsh.model.occ.addRectangle
+
+    slits = Bitter.coolingslits
+    gmsh_tierod = []
+
+    # eps: thickness of annular ring equivalent to n * coolingslit surface
+    rs = np.fromiter((slit.r for slit in slits), dtype=float, count=len(slits))
+    epss = np.array(slits_eps(Bitter), dtype=float)
+    xmins = rs - epss / 2.0
+    if debug:
+        for i, eps in enumerate(epss):
+            print(f"slit[{i}]: eps={eps}")
 
-        if not thickslit:
-            for i, slit in enumerate(Bitter.coolingslits):
-                x = float(slit.r)
-                pt1 = gmsh.model.occ.addPoint(x, Bitter.z[0], 0)
-                pt2 = gmsh.model.occ.addPoint(x, Bitter.z[1], 0)
-                _id = gmsh.model.occ.addLine(pt1, pt2)
-                gmsh_cracks.append(_id)
+    z0, dz = Bitter.z[0], Bitter.z[1] - Bitter.z[0]
+    gmsh_slits = [
+        _addRect(xmin, z0, 0, eps, dz) for xmin, eps in zip(xmins.tolist(), epss.tolist())
+    ]
+    if debug:
+        print(f"gmsh_slits {len(gmsh_slits)}=", gmsh_slits)
+
+    o, m = gmsh.model.occ.cut(
+        domain,
+        [(2, _id) for _id in gmsh_slits + gmsh_tierod],
+        removeObject=True,
+        removeTool=True,
+    )
+    return (gmsh_slits, m)
 
-            domain = [(2, i) for i in gmsh_ids]
-            cuts = [(1, i) for i in gmsh_cracks]
-            o, m = gmsh.model.occ.fragment(domain, cuts)
-            gmsh.model.occ.synchronize()
 
+def gmsh_ids(Bitter: Bitter, AirData: tuple, thickslit: bool = False, debug: bool = False) -> tuple:
+    """
+    create gmsh geometry
+
+    thickslit: boolean, True for Thickslit else False
+
+    """
+    print(f"gmsh_ids: Bitter={Bitter.name}, thickslit={thickslit}")
+
+    # flat list of surface ids, kept alongside gmsh_ids
+    flat_ids = gmsh_sections(Bitter)
+    # gmsh_ids is always returned as list[list[int]]
+    gmsh_ids = [[_id] for _id in flat_ids]
+    gmsh_cracks: list[list[int]] = []
+
+    # nothing to fragment: neither cooling slits nor air
+    if not Bitter.coolingslits and not AirData:
+        gmsh.model.occ.synchronize()
+        return (gmsh_ids, gmsh_cracks, ())
+
+    # Cooling Channels
+    if Bitter.coolingslits:
+        domain = [(2, i) for i in flat_ids]
+        if thickslit:
+            (gmsh_slits, m) = gmsh_thick_slits(Bitter, domain, debug)
         else:
-            gmsh_slits = []
-            gmsh_tierod = []
-
-            for i, slit in enumerate(Bitter.coolingslits):
-                # eps: thickness of annular ring equivalent to n * coolingslit surface
-                x = slit.r
-                eps = Bitter.equivalent_eps(i)
-                print(f"slit[{i}]: eps={eps}")
-
-                _id = gmsh.model.occ.addRectangle(
-                    x - eps / 2.0, Bitter.z[0], 0, eps, abs(Bitter.z[1] - Bitter.z[0])
-                )
-                gmsh_slits.append(_id)
-            print(f"gmsh_slits {len(gmsh_slits)}=", gmsh_slits)
-
-            o, m = gmsh.model.occ.cut(
-                [(2, _id) for _id in gmsh_ids],
-                [(2, _id) for _id in gmsh_slits + gmsh_tierod],
-                removeObject=True,
-                removeTool=True,
-            )
-            gmsh.model.occ.synchronize()
-
-        for j, entries in enumerate(m):
-            _ids = []
-            _cracks = []
-            for dim, tag in entries:
-                if dim == 2:
-                    _ids.append(tag)
-                if dim == 1:
-                    _cracks.append(tag)
-            if _ids and _ids not in [[_id] for _id in gmsh_slits]:
+            (gmsh_slits, m) = gmsh_thin_slits(Bitter, domain, debug)
+
+        flat_ids = []
+        ngmsh_ids = []
+        ngmsh_cracks = []
+        slit_entries = [[_id] for _id in gmsh_slits]
+        for entries in m:
+            (_ids, _cracks) = split_by_dim(entries)
+            if _ids and _ids not in slit_entries:
                 ngmsh_ids.append(_ids)
+                flat_ids.extend(_ids)
             if _cracks:
                 ngmsh_cracks.append(_cracks)
 
-        # print(f'Bitter/gmsh_bcs: ngmsh_ids={ngmsh_ids}, ngmsh_cracks: {ngmsh_cracks}')
         gmsh_ids = ngmsh_ids
         gmsh_cracks = ngmsh_cracks
-        # print(f'Bitter/gmsh_id: gmsh_ids={gmsh_ids}, gmsh_cracks: {gmsh_cracks}')
 
     if debug:
         print(f"gmsh_ids: {gmsh_ids}, gmsh_cracks: {gmsh_cracks}")
@@ -145,16 +200,16 @@ def gmsh_ids(Bitter: Bitter, AirData: tuple, thickslit: bool = False, debug: boo
     # Now create air
     Air_data = ()
     if AirData:
-        from .Air import gmsh_air
-
         (r0_air, z0_air, dr_air, dz_air) = gmsh_air(Bitter, AirData)
         _id = gmsh.model.occ.addRectangle(r0_air, z0_air, 0, dr_air, dz_air)
 
-        ov, ovv = gmsh.model.occ.fragment([(2, _id)], [(2, i) for i in flatten(gmsh_ids)])
-        gmsh.model.occ.synchronize()
+        ov, ovv = gmsh.model.occ.fragment([(2, _id)], [(2, i) for i in flat_ids])
         Air_data = (_id, dr_air, z0_air, dz_air)
 
-    print("total gmsh_ids=", gmsh_ids, len(gmsh_ids))
+    # single synchronize once all OCC operations are done
+    gmsh.model.occ.synchronize()
+    if debug:
+        print("total gmsh_ids=", gmsh_ids, len(gmsh_ids))
     return (gmsh_ids, gmsh_cracks, Air_data)
 
 
@@ -176,12 +231,15 @@ def gmsh_bcs(
     )
 
     psnames = Bitter.get_names(mname, is2D=True, verbose=debug)
-    print(f"Bitter: psnames={psnames} ({len(psnames)}), B_ids={len(flatten(B_ids))}")
-    print(f"Bitter: B_ids={B_ids}))")
-    assert len(flatten(B_ids)) == len(
+    n_flat = sum(len(_id) for _id in B_ids)
+    if debug:
+        print(f"Bitter: psnames={psnames} ({len(psnames)}), B_ids={n_flat}")
+        print(f"Bitter: B_ids={B_ids}))")
+    assert n_flat == len(
         psnames
-    ), f"Bitter/gmsh_bcs {Bitter.name}: trouble with psnames (expected {len(psnames)} got {len(flatten(B_ids))})"
-    print(f"Bitter: mname={mname}, psnames={psnames}")
+    ), f"Bitter/gmsh_bcs {Bitter.name}: trouble with psnames (expected {len(psnames)} got {n_flat})"
+    if debug:
+        print(f"Bitter: mname={mname}, psnames={psnames}")
     prefix = ""
     if mname:
         prefix = f"{mname}_"
@@ -190,80 +248,69 @@ def gmsh_bcs(
     if not psnames:
         psnames.append(f"{mname}_B0_S0")
 
+    # group surfaces sharing the same name into a single physical group
+    groups: dict[str, list[int]] = {}
     num = 0
     for i, id in enumerate(B_ids):
-        if isinstance(id, int):
-            ps = gmsh.model.addPhysicalGroup(2, [id])
-        else:
-            ps = gmsh.model.addPhysicalGroup(2, id)
+        psname = _SECTION_RE.sub("", psnames[num])
+        if debug:
+            print(
+                f"Bitter[{i}]: id={id}, mname={mname}, psnames[{num}]={psnames[num]}, psname={psname} / {len(B_ids)}"
+            )
+        groups.setdefault(psname, []).extend(id)
+        num += len(id)
 
-        print(f"i={i}, id={id}, num={num}, {psnames[num]}", flush=True)
-        psname = re.sub(r"_S\d+", "", psnames[num])
-        print(
-            f"Bitter[{i}]: id={id}, mname={mname}, psnames[{num}]={psnames[num]}, psname={psname} / {len(B_ids)}",
-            flush=True,
-        )
+    for psname, tags in groups.items():
+        ps = gmsh.model.addPhysicalGroup(2, tags)
         gmsh.model.setPhysicalName(2, ps, psname)
         defs[psname] = ps
 
-        if isinstance(id, int):
-            num += 1
-        else:
-            num += len(id)
-
     # get BC ids
-    gmsh.option.setNumber("Geometry.OCCBoundsUseStl", 1)
-
-    bcs_defs = {
-        f"{prefix}HP": [Bitter.r[0], Bitter.z[0], Bitter.r[-1], Bitter.z[0]],
-        f"{prefix}BP": [Bitter.r[0], Bitter.z[-1], Bitter.r[-1], Bitter.z[-1]],
-    }
+    r0, r1 = Bitter.r[0], Bitter.r[-1]
+    z0, z1 = Bitter.z[0], Bitter.z[-1]
+    bcs_defs = [
+        (f"{prefix}HP", [r0, z0, r1, z0]),
+        (f"{prefix}BP", [r0, z1, r1, z1]),
+    ]
 
-    n_slits = 0
-    if Bitter.coolingslits is not None:
-        n_slits = len(Bitter.coolingslits)
+    slits = Bitter.coolingslits or []
+    n_slits = len(slits)
+    coolingslit = n_slits > 0
 
-    bcs_defs[f"{prefix}Slit0"] = [Bitter.r[0], Bitter.z[0], Bitter.r[0], Bitter.z[1]]
+    bcs_defs.append((f"{prefix}Slit0", [r0, z0, r0, z1]))
 
     # Cooling Channels
-    if Bitter.coolingslits is not None:
-        print(f"Cracks_ids={Cracks_ids}")
+    if coolingslit:
+        if debug:
+            print(f"Cracks_ids={Cracks_ids}")
         if len(Cracks_ids) > 0:
             for i, id in enumerate(Cracks_ids):
-                print(f"Slit{i+1}: {id}")
-                if isinstance(id, int):
-                    ps = gmsh.model.addPhysicalGroup(1, [id])
-                else:
-                    ps = gmsh.model.addPhysicalGroup(1, id)
+                if debug:
+                    print(f"Slit{i+1}: {id}")
+                ps = gmsh.model.addPhysicalGroup(1, id)
                 psname = f"{prefix}Slit{i+1}"
                 gmsh.model.setPhysicalName(1, ps, psname)
                 defs[psname] = ps
         else:
-            for i, slit in enumerate(Bitter.coolingslits):
-                x = slit.r
-                eps = Bitter.equivalent_eps(i)
-
-                # Add Slit on both side
-                # if i != 0:
-                #    sname = f"{prefix}Slit{i+1}"
-                #    bcs_defs[sname] = [
-                #        [x - eps / 2.0, Bitter.z[0], x + eps / 2.0, Bitter.z[1]]
-                #    ]
-                #    print(f"add {sname} to bcs_defs", flush=True)
-                # else:
+            # compute slit bounds for all slits at once
+            rs = np.array([float(slit.r) for slit in slits])
+            half_eps = 0.5 * np.array(slits_eps(Bitter))
+
+            # Add Slit on both side: boxes[i] = [[x-eps/2, z0, x, z1], [x, z0, x+eps/2, z1]]
+            boxes = np.empty((n_slits, 2, 4), dtype=np.float64)
+            boxes[:, 0, 0] = rs - half_eps
+            boxes[:, 1, 0] = rs
+            boxes[:, 0, 2] = rs
+            boxes[:, 1, 2] = rs + half_eps
+            boxes[:, :, 1] = z0
+            boxes[:, :, 3] = z1
+            for i, box in enumerate(boxes):
                 sname = f"{prefix}Slit{i+1}"
-                bcs_defs[sname] = [
-                    [x - eps / 2.0, Bitter.z[0], x, Bitter.z[1]],
-                    [x, Bitter.z[0], x + eps / 2.0, Bitter.z[1]],
-                ]
-                print(f"add {sname} to bcs_defs", flush=True)
-
-    bcs_defs[f"{prefix}Slit{n_slits+1}"] = [
-        Bitter.r[1],
-        Bitter.z[0],
-        Bitter.r[1],
-        Bitter.z[1],
-    ]
+                bcs_defs.append((sname, box.tolist()))
+                if debug:
+                    print(f"add {sname} to bcs_defs")
+
+    bcs_defs.append((f"{prefix}Slit{n_slits+1}", [r1, z0, r1, z1]))
 
     # Air
     if Air_data:
@@ -276,17 +323,18 @@ def gmsh_bcs(
         defs["Air"] = ps
 
         # TODO: Axis, Inf
-        gmsh.option.setNumber("Geometry.OCCBoundsUseStl", 1)
-
-        bcs_defs["ZAxis"] = [0, z0_air, 0, z0_air + dz_air]
-        bcs_defs["Infty"] = [
-            [0, z0_air, dr_air, z0_air],
-            [dr_air, z0_air, dr_air, z0_air + dz_air],
-            [0, z0_air + dz_air, dr_air, z0_air + dz_air],
-        ]
-
-    for key, values in bcs_defs.items():
-        print(f"create_bcs({key}, values={values})", flush=True)
-        defs[key] = create_bcs(key, values, 1)
+        bcs_defs.append(("ZAxis", [0, z0_air, 0, z0_air + dz_air]))
+        bcs_defs.append(
+            (
+                "Infty",
+                [
+                    [0, z0_air, dr_air, z0_air],
+                    [dr_air, z0_air, dr_air, z0_air + dz_air],
+                    [0, z0_air + dz_air, dr_air, z0_air + dz_air],
+                ],
+            )
+        )
+
+    defs.update(create_bcs_batch(bcs_defs, 1))
 
     return defs
@@ -3,11 +3,14 @@
 
 """defines Bitter Insert structure"""
 
+from itertools import repeat
+
+import gmsh
+
 from python_magnetgeo.Bitter import Bitter
 from python_magnetgeo.Bitters import Bitters
-from ..utils.lists import flatten
-from ..mesh.bcs import create_bcs
-from importlib import import_module
+from ..mesh.bcs import create_bcs_batch
+from ..utils.modules import load_module
 from ..logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -19,11 +22,10 @@ def gmsh_box(Bitters: Bitters, debug: bool = False) -> list:
     """
     get boundingbox for each slit
     """
-    from importlib import import_module
 
     boxes = []
     for i, magnet in enumerate(Bitters.magnets):
-        MyMagnet = import_module(import_dict[type(magnet)], package="python_magnetgmsh")
+        MyMagnet = load_module(import_dict[type(magnet)])
         box = MyMagnet.gmsh_box(magnet, debug)
         boxes.append(box)
     return boxes
@@ -35,18 +37,22 @@ def gmsh_ids(
     """
     create gmsh geometry
     """
-    import gmsh
 
     print(f"gmsh_ids: Bitters={Bitters.name}, thickslit={thickslit}")
     gmsh_ids = []
     crack_ids = []
+    flat_list = []
 
     for magnet in Bitters.magnets:
-        print(f"Bitters/gmsh_ids: magnet={magnet.name}")
-        MyMagnet = import_module(import_dict[type(magnet)], package="python_magnetgmsh")
-        ids = MyMagnet.gmsh_ids(magnet, AirData, thickslit, debug)
+        if debug:
+            print(f"Bitters/gmsh_ids: magnet={magnet.name}")
+        MyMagnet = load_module(import_dict[type(magnet)])
+        # air is added once for the whole set, after the loop
+        ids = MyMagnet.gmsh_ids(magnet, (), thickslit, debug)
         gmsh_ids.append(ids[0])
         crack_ids.append(ids[1])
+        # ids[0] is a list[list[int]]
+        flat_list += [i for sub in ids[0] for i in sub]
         if debug:
             print(f"Bitters/gmsh_ids: magnet={magnet.name} ids={ids}")
 
@@ -61,13 +67,14 @@ def gmsh_ids(
         r0_air = 0
         dr_air = r_max * AirData[0]
         z0_air = z_min * AirData[1]
-        dz_air = abs(z_max - z_min) * AirData[1]
+        # boundingBox returns ordered ranges
+        dz_air = (z_max - z_min) * AirData[1]
         A_id = gmsh.model.occ.addRectangle(r0_air, z0_air, 0, dr_air, dz_air)
 
-        flat_list = flatten(gmsh_ids)
-        print(f"flat_list: {flat_list}")
+        if debug:
+            print(f"flat_list: {flat_list}")
 
-        ov, ovv = gmsh.model.occ.fragment([(2, A_id)], [(2, j) for j in flat_list])
+        ov, ovv = gmsh.model.occ.fragment([(2, A_id)], list(zip(repeat(2), flat_list)))
         """
         print(f'Air fragment map: A_id={A_id}')
         print("fragment produced surfaces:")
@@ -95,7 +102,6 @@ def gmsh_bcs(
     """
     retreive ids for bcs in gmsh geometry
     """
-    import gmsh
 
     print(f"gmsh_bcs: Bitters={Bitters.name}, mname={mname}, thickslit={thickslit}")
     (gmsh_ids, crack_ids, Air_data) = ids
@@ -108,17 +114,16 @@ def gmsh_bcs(
     defs = {}
     bcs_defs = {}
 
-    num = 0
-    for i, magnet in enumerate(Bitters.magnets):
-        print(f"Bitters/gmsh/{magnet.name} Bitter[{i}]: {gmsh_ids[num]}")
-        _ids = (gmsh_ids[num], crack_ids[num], ())
-        MyMagnet = import_module(import_dict[type(magnet)], package="python_magnetgmsh")
+    for i, (magnet, B_ids, B_cracks) in enumerate(zip(Bitters.magnets, gmsh_ids, crack_ids)):
+        if debug:
+            print(f"Bitters/gmsh/{magnet.name} Bitter[{i}]: {B_ids}")
+        _ids = (B_ids, B_cracks, ())
+        MyMagnet = load_module(import_dict[type(magnet)])
         tdefs = MyMagnet.gmsh_bcs(magnet, f"{prefix}{magnet.name}", _ids, thickslit, debug)
         defs.update(tdefs)
 
-        num += 1
-
-    print(f"Bitters: defs={defs.keys()}")
+    if debug:
+        print(f"Bitters: defs={defs.keys()}")
 
     # Air
     if Air_data:
@@ -130,8 +135,6 @@ def gmsh_bcs(
         gmsh.model.setPhysicalName(2, ps, "Air")
         defs["Air"] = ps
         # TODO: Axis, Inf
-        gmsh.option.setNumber("Geometry.OCCBoundsUseStl", 1)
-
         bcs_defs["ZAxis"] = [0, z0_air, 0, z0_air + dz_air]
         bcs_defs["Infty"] = [
             [0, z0_air, dr_air, z0_air],
@@ -139,8 +142,7 @@ def gmsh_bcs(
             [0, z0_air + dz_air, dr_air, z0_air + dz_air],
         ]
 
-    for key in bcs_defs:
-        defs[key] = create_bcs(key, bcs_defs[key], 1)
+    defs.update(create_bcs_batch(bcs_defs, 1))
 
     gmsh.model.occ.synchronize()
 
@@ -9,12 +9,14 @@ Provides definition for Helix:
 * Model 3D: actual 3D CAD
 * Shape: definition of Shape eventually added to the helical cut
 """
+from itertools import repeat
+
 from python_magnetgeo.Chamfer import Chamfer
 from python_magnetgeo.Helix import Helix
 
 import gmsh
 
-from ..mesh.bcs import create_bcs
+from ..mesh.bcs import create_bcs_batch
 from ..logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -51,40 +53,43 @@ def gmsh_chamfer(r: float, z: float, chamfer: Chamfer, debug: bool = False) -> i
         f"gmsh_chamfer: side={side}, rside={rside}, alpha={alpha}, L={L}, cradius={cradius}, r={r}, z={z}"
     )
 
+    _addPoint = gmsh.model.occ.addPoint
+    _addLine = gmsh.model.occ.addLine
+    _addCurveLoop = gmsh.model.occ.addCurveLoop
+
     contour = None
     if side == "BP":
-        P0 = gmsh.model.occ.addPoint(r, z, 0)
-        P1 = gmsh.model.occ.addPoint(r, z - L, 0)
+        P0 = _addPoint(r, z, 0)
+        P1 = _addPoint(r, z - L, 0)
         if rside == "rext":
-            P2 = gmsh.model.occ.addPoint(r - cradius, z, 0)
-            P0P2 = gmsh.model.occ.addLine(P0, P2)
-            P2P1 = gmsh.model.occ.addLine(P2, P1)
-            P1P0 = gmsh.model.occ.addLine(P1, P0)
-            contour = gmsh.model.occ.addCurveLoop([P0P2, P2P1, P1P0])
+            P2 = _addPoint(r - cradius, z, 0)
+            P0P2 = _addLine(P0, P2)
+            P2P1 = _addLine(P2, P1)
+            P1P0 = _addLine(P1, P0)
+            contour = _addCurveLoop([P0P2, P2P1, P1P0])
         else:
-            P2 = gmsh.model.occ.addPoint(r + cradius, z, 0)
-            P0P1 = gmsh.model.occ.addLine(P0, P1)
-            P1P2 = gmsh.model.occ.addLine(P1, P2)
-            P2P0 = gmsh.model.occ.addLine(P2, P0)
-            contour = gmsh.model.occ.addCurveLoop([P0P1, P1P2, P2P0])
+            P2 = _addPoint(r + cradius, z, 0)
+            P0P1 = _addLine(P0, P1)
+            P1P2 = _addLine(P1, P2)
+            P2P0 = _addLine(P2, P0)
+            contour = _addCurveLoop([P0P1, P1P2, P2P0])
 
     if side == "HP":
-        P0 = gmsh.model.occ.addPoint(r, z, 0)
-        P1 = gmsh.model.occ.addPoint(r, z + L, 0)
+        P0 = _addPoint(r, z, 0)
+        P1 = _addPoint(r, z + L, 0)
         if rside == "rint":
-            P2 = gmsh.model.occ.addPoint(r + cradius, z, 0)
-            P0P1 = gmsh.model.occ.addLine(P0, P1)
-            P1P2 = gmsh.model.occ.addLine(P1, P2)
-            P2P0 = gmsh.model.occ.addLine(P2, P0)
-            contour = gmsh.model.occ.addCurveLoop([P0P1, P1P2, P2P0])
+            P2 = _addPoint(r + cradius, z, 0)
+            P0P1 = _addLine(P0, P1)
+            P1P2 = _addLine(P1, P2)
+            P2P0 = _addLine(P2, P0)
+            contour = _addCurveLoop([P0P1, P1P2, P2P0])
         else:
-            P2 = gmsh.model.occ.addPoint(r - cradius, z, 0)
-            P0P2 = gmsh.model.occ.addLine(P0, P2)
-            P2P1 = gmsh.model.occ.addLine(P2, P1)
-            P1P0 = gmsh.model.occ.addLine(P1, P0)
-            contour = gmsh.model.occ.addCurveLoop([P0P2, P2P1, P1P0])
+            P2 = _addPoint(r - cradius, z, 0)
+            P0P2 = _addLine(P0, P2)
+            P2P1 = _addLine(P2, P1)
+            P1P0 = _addLine(P1, P0)
+            contour = _addCurveLoop([P0P2, P2P1, P1P0])
 
-    gmsh.model.occ.synchronize()
     surf = gmsh.model.occ.addPlaneSurface([contour])
     logger.debug(f"gmsh_chamfer surf: {surf}")
     return surf
@@ -100,46 +105,69 @@ def gmsh_ids(Helix: Helix, AirData: tuple, debug: bool = False) -> tuple:
     x = Helix.r[0]
     dr = Helix.r[1] - Helix.r[0]
     y = -Helix.modelaxi.h
+    _addRect = gmsh.model.occ.addRectangle
 
     # from Chamfers get HPChamfer and BPChamfer
-    HPChamfers = [chamfer for chamfer in Helix.chamfers if chamfer.side == "HP"]
-    BPChamfers = [chamfer for chamfer in Helix.chamfers if chamfer.side == "BP"]
+    HPChamfers = []
+    BPChamfers = []
+    for chamfer in Helix.chamfers:
+        if chamfer.side == "HP":
+            HPChamfers.append(chamfer)
+        elif chamfer.side == "BP":
+            BPChamfers.append(chamfer)
     logger.debug(f"{Helix.name}: HPChamfers: {HPChamfers}")
     logger.debug(f"{Helix.name}: BPChamfers: {BPChamfers}")
     # Add chamfer on HP here
-    if abs(y - Helix.z[0]) >= 0:
-        _id = gmsh.model.occ.addRectangle(x, Helix.z[0], 0, dr, abs(y - Helix.z[0]))
-        for chamfer in HPChamfers:
-            if chamfer.rside == "rint":
-                chamfer_id = gmsh_chamfer(Helix.r[0], Helix.z[0], chamfer, debug)
-            else:
-                chamfer_id = gmsh_chamfer(Helix.r[1], Helix.z[0], chamfer, debug)
-            gmsh.model.occ.cut(
-                [(2, _id)], [(2, chamfer_id)], tag=-1, removeObject=True, removeTool=True
-            )
-            gmsh.model.occ.synchronize()
-        gmsh_ids.append(_id)
+    # end pieces are always created: Cu0 and Cu{N+1} in get_names
+    _id = _addRect(x, Helix.z[0], 0, dr, abs(y - Helix.z[0]))
+    chamfer_ids = [
+        gmsh_chamfer(
+            Helix.r[0] if chamfer.rside == "rint" else Helix.r[1],
+            Helix.z[0],
+            chamfer,
+            debug,
+        )
+        for chamfer in HPChamfers
+    ]
+    if chamfer_ids:
+        gmsh.model.occ.cut(
+            [(2, _id)],
+            [(2, chamfer_id) for chamfer_id in chamfer_ids],
+            tag=-1,
+            removeObject=True,
+            removeTool=True,
+        )
+        gmsh.model.occ.synchronize()
+    gmsh_ids.append(_id)
 
     for i, (n, pitch) in enumerate(zip(Helix.modelaxi.turns, Helix.modelaxi.pitch)):
         dz = n * pitch
-        _id = gmsh.model.occ.addRectangle(x, y, 0, dr, dz)
+        _id = _addRect(x, y, 0, dr, dz)
         gmsh_ids.append(_id)
 
         y += dz
 
     # Add chamfer on BP here
-    if abs(Helix.z[1] - y) >= 0:
-        _id = gmsh.model.occ.addRectangle(x, y, 0, dr, abs(Helix.z[1] - y))
-        for chamfer in BPChamfers:
-            if chamfer.rside == "rext":
-                chamfer_id = gmsh_chamfer(Helix.r[1], Helix.z[1], chamfer, debug)
-            else:
-                chamfer_id = gmsh_chamfer(Helix.r[0], Helix.z[1], chamfer, debug)
-            gmsh.model.occ.cut(
-                [(2, _id)], [(2, chamfer_id)], tag=-1, removeObject=True, removeTool=True
-            )
-            gmsh.model.occ.synchronize()
-        gmsh_ids.append(_id)
+    _id = _addRect(x, y, 0, dr, abs(Helix.z[1] - y))
+    chamfer_ids = [
+        gmsh_chamfer(
+            Helix.r[1] if chamfer.rside == "rext" else Helix.r[0],
+            Helix.z[1],
+            chamfer,
+            debug,
+        )
+        for chamfer in BPChamfers
+    ]
+    if chamfer_ids:
+        gmsh.model.occ.cut(
+            [(2, _id)],
+            [(2, chamfer_id) for chamfer_id in chamfer_ids],
+            tag=-1,
+            removeObject=True,
+            removeTool=True,
+        )
+        gmsh.model.occ.synchronize()
+    gmsh_ids.append(_id)
     if debug:
         gmsh.fltk.run()
 
@@ -151,7 +179,7 @@ def gmsh_ids(Helix: Helix, AirData: tuple, debug: bool = False) -> tuple:
         dz_air = abs(Helix.z[0] - Helix.z[1]) * AirData[1]
         _id = gmsh.model.occ.addRectangle(r0_air, z0_air, 0, dr_air, dz_air)
 
-        ov, ovv = gmsh.model.occ.fragment([(2, _id)], [(2, i) for i in gmsh_ids])
+        ov, ovv = gmsh.model.occ.fragment([(2, _id)], list(zip(repeat(2), gmsh_ids)))
         gmsh.model.occ.synchronize()
         return (gmsh_ids, (_id, dr_air, z0_air, dz_air))
 
@@ -181,8 +209,6 @@ def gmsh_bcs(Helix: Helix, mname: str, ids: tuple, debug: bool = False) -> dict:
         defs[f"{prefix}Cu{i}"] = ps
 
     # get BC ids
-    gmsh.option.setNumber("Geometry.OCCBoundsUseStl", 1)
-
     zmin = Helix.z[0]
     zmax = Helix.z[1]
 
@@ -190,16 +216,13 @@ def gmsh_bcs(Helix: Helix, mname: str, ids: tuple, debug: bool = False) -> dict:
     rint_range = [Helix.r[0], Helix.r[0]]
     rext_range = [Helix.r[1], Helix.r[1]]
     if Helix.chamfers:
-        chamfer_rint = [
-            Helix.r[0] + chamfer.getRadius()
-            for chamfer in Helix.chamfers
-            if chamfer.rside == "rint"
-        ]
-        chamfer_rext = [
-            Helix.r[1] - chamfer.getRadius()
-            for chamfer in Helix.chamfers
-            if chamfer.rside == "rext"
-        ]
+        chamfer_rint = []
+        chamfer_rext = []
+        for chamfer in Helix.chamfers:
+            if chamfer.rside == "rint":
+                chamfer_rint.append(Helix.r[0] + chamfer.getRadius())
+            elif chamfer.rside == "rext":
+                chamfer_rext.append(Helix.r[1] - chamfer.getRadius())
         logger.debug(f"{Helix.name}: chamfer_rint: {chamfer_rint}")
         logger.debug(f"{Helix.name}: chamfer_rext: {chamfer_rext}")
 
@@ -215,7 +238,6 @@ def gmsh_bcs(Helix: Helix, mname: str, ids: tuple, debug: bool = False) -> dict:
         f"{prefix}rExt": [rext_range[0], zmin, rext_range[1], zmax],
     }
 
-    for key in bcs_defs:
-        defs[key] = create_bcs(key, bcs_defs[key], 1)
+    defs.update(create_bcs_batch(bcs_defs, 1))
 
     return defs
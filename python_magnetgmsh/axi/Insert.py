@@ -3,6 +3,8 @@
 
 """defines Insert structure"""
 
+from itertools import chain, repeat
+
 from python_magnetgeo.Insert import Insert
 
 import gmsh
@@ -11,9 +13,9 @@ from .Helix import gmsh_bcs as helix_bcs
 from .Ring import gmsh_ids as ring_ids
 from .Ring import gmsh_bcs as ring_bcs
 
-from ..mesh.bcs import create_bcs
-from ..utils.lists import flatten
+from ..mesh.bcs import create_bcs_batch
 
+import numpy as np
 from numpy import ndarray
 
 from ..logging_config import get_logger
@@ -35,15 +37,16 @@ def gmsh_box(Insert: Insert, debug: bool = False) -> list:
     innerbore = Insert.innerbore
     outerbore = Insert.outerbore
 
+    # helices r, z and rings height as arrays
+    hr = np.array([Helix.r for Helix in Helices], dtype=float)
+    hz = np.array([Helix.z for Helix in Helices], dtype=float)
+    hring = np.array([abs(Ring.z[-1] - Ring.z[0]) for Ring in Rings], dtype=float)
+
     # channel0
     r0 = innerbore
     r1 = Helices[0].r[0]
     z0 = Helices[0].z[0]
-
-    hring = 0
-    if len(Rings) >= 1:
-        hring = abs(Rings[0].z[-1] - Rings[0].z[0])
-    z1 = Helices[0].z[1] + hring
+    z1 = Helices[0].z[1] + (float(hring[0]) if len(Rings) >= 1 else 0)
     lc = (r1 - r0) / 3.0
     box = ([r0, z0, 0, r1, z1, 0], lc)
     boxes.append(box)
@@ -51,46 +54,34 @@ def gmsh_box(Insert: Insert, debug: bool = False) -> list:
     # channel1
     r0 = Helices[0].r[1]
     r1 = Helices[1].r[0]
-    hring = 0
-    if len(Rings) >= 2:
-        hring = abs(Rings[1].z[-1] - Rings[1].z[0])
-    z0 = min(Helices[0].z[0], Helices[1].z[0] - hring)
+    z0 = min(Helices[0].z[0], Helices[1].z[0] - (float(hring[1]) if len(Rings) >= 2 else 0))
     z1 = Helices[0].z[1]
     lc = (r1 - r0) / 3.0
     box = ([r0, z0, 0, r1, z1, 0], lc)
     boxes.append(box)
 
-    iH = 1
-    for i in range(1, len(Rings) - 1):
-        print(f"Box channel[{i+1}]:")
-
-        r0 = Helices[iH].r[0]
-        r1 = Helices[iH + 1].r[0]
-
-        # check for HP (odd), BP (even)
-        hring = abs(Rings[i - 1].z[-1] - Rings[i - 1].z[0])
-        hring_ = abs(Rings[i + 1].z[-1] - Rings[i + 1].z[0])
-        if i % 2 != 0:
-            z0 = Helices[iH].z[0]
-            z1 = max(Helices[iH].z[1] + hring, Helices[iH + 1].z[1] + hring_)
-        else:
-            z0 = min(Helices[iH].z[0] - hring, Helices[iH + 1].z[0] - hring_)
-            z1 = Helices[iH].z[1]
-
-        lc = (r1 - r0) / 3.0
+    # channel[i+1], for i in [1, len(Rings)-1[, between Helices[iH] and Helices[iH+1]
+    i = np.arange(1, len(Rings) - 1)
+    iH = 2 * (i // 2) + 1
+    # check for HP (odd), BP (even)
+    odd = i % 2 != 0
+    hring_prev = hring[i - 1]
+    hring_next = hring[i + 1]
+    r0s = hr[iH, 0]
+    r1s = hr[iH + 1, 0]
+    z0s = np.where(odd, hz[iH, 0], np.minimum(hz[iH, 0] - hring_prev, hz[iH + 1, 0] - hring_next))
+    z1s = np.where(odd, np.maximum(hz[iH, 1] + hring_prev, hz[iH + 1, 1] + hring_next), hz[iH, 1])
+    lcs = (r1s - r0s) / 3.0
+    for r0, z0, r1, z1, lc in zip(
+        r0s.tolist(), z0s.tolist(), r1s.tolist(), z1s.tolist(), lcs.tolist()
+    ):
         box = ([r0, z0, 0, r1, z1, 0], lc)
         boxes.append(box)
 
-        if i % 2 != 0:
-            iH += 2
-
     # Last but one channel
     r0 = Helices[-2].r[1]
     r1 = Helices[-1].r[0]
-    hring = 0
-    if len(Rings) >= 2:
-        hring = abs(Rings[-2].z[-1] - Rings[-2].z[0])
-    z0 = min(Helices[-1].z[0], Helices[-2].z[0] - hring)
+    z0 = min(Helices[-1].z[0], Helices[-2].z[0] - (float(hring[-2]) if len(Rings) >= 2 else 0))
     z1 = Helices[-1].z[1]
     lc = (r1 - r0) / 3.0
     box = ([r0, z0, 0, r1, z1, 0], lc)
@@ -99,13 +90,13 @@ def gmsh_box(Insert: Insert, debug: bool = False) -> list:
     # last channel
     r0 = Helices[-1].r[0]
     r1 = outerbore
-    hring = abs(Rings[-1].z[-1] - Rings[-1].z[0])
     z0 = Helices[-1].z[0]
-    z1 = Helices[-1].z[1] + hring
+    z1 = Helices[-1].z[1] + float(hring[-1])
     box = ([r0, z0, 0, r1, z1, 0], lc)
     boxes.append(box)
 
-    print(f"gmsh_box(Insert): {boxes}")
+    if debug:
+        print(f"gmsh_box(Insert): {boxes}")
     return boxes
 
 
@@ -130,6 +121,8 @@ def gmsh_ids(Insert: Insert, AirData: tuple, Thickslit: bool = False, debug: boo
     # loop over Rings
     R_ids = []
     if Insert.rings:
+        # each ring joins the HP (odd) or BP (even) ends of 2 helices
+        tools = []
         for i, Ring in enumerate(Insert.rings):
             y = z[i]
             if i % 2 != 0:
@@ -137,23 +130,18 @@ def gmsh_ids(Insert: Insert, AirData: tuple, Thickslit: bool = False, debug: boo
 
             _id = ring_ids(Ring, y, debug)
             R_ids.append(_id)
-            # fragment
             if i % 2 != 0:
-                ov, ovv = gmsh.model.occ.fragment(
-                    [(2, _id)], [(2, H_ids[i][0]), (2, H_ids[i + 1][0])]
-                )
+                tools += [(2, H_ids[i][0]), (2, H_ids[i + 1][0])]
             else:
-                ov, ovv = gmsh.model.occ.fragment(
-                    [(2, _id)], [(2, H_ids[i][-1]), (2, H_ids[i + 1][-1])]
-                )
-            gmsh.model.occ.synchronize()
-
-            if debug:
-                print(
-                    f"Insert/Ring[{i}]: R_id={_id}, fragment produced volumes: {len(ov)}, {len(ovv)}"
-                )
-                for e in ov:
-                    print(e)
+                tools += [(2, H_ids[i][-1]), (2, H_ids[i + 1][-1])]
+
+        # fragment all rings at once
+        ov, ovv = gmsh.model.occ.fragment([(2, _id) for _id in R_ids], tools)
+
+        if debug:
+            print(f"Insert/Rings: R_ids={R_ids}, fragment produced volumes: {len(ov)}, {len(ovv)}")
+            for e in ov:
+                print(e)
 
     # Now create air
     Air_data = ()
@@ -166,15 +154,14 @@ def gmsh_ids(Insert: Insert, AirData: tuple, Thickslit: bool = False, debug: boo
         dz_air = abs(z[1] - z[0]) * AirData[1]
         A_id = gmsh.model.occ.addRectangle(r0_air, z0_air, 0, dr_air, dz_air)
 
-        flat_list = flatten(H_ids)
-        flat_list += R_ids
+        # H_ids is a list of list[int] (one per helix)
+        flat_list = list(chain.from_iterable(H_ids)) + R_ids
 
-        ov, ovv = gmsh.model.occ.fragment([(2, A_id)], [(2, i) for i in flat_list])
-        gmsh.model.occ.synchronize()
-
-        # need to account for changes
+        ov, ovv = gmsh.model.occ.fragment([(2, A_id)], list(zip(repeat(2), flat_list)))
         Air_data = (A_id, dr_air, z0_air, dz_air)
 
+    # need to account for changes (rings and air fragments)
+    gmsh.model.occ.synchronize()
     return (H_ids, R_ids, Air_data)
 
 
@@ -204,8 +191,9 @@ def gmsh_bcs(
     # loop over Helices
     z = []
     NHelices = len(Insert.helices)
-    num = 0
-    for i, Helix in enumerate(Insert.helices):
+    # offset of each helix (turns + 2 names) then of the rings in psnames
+    offsets = np.cumsum([0] + [len(Helix.modelaxi.turns) + 2 for Helix in Insert.helices]).tolist()
+    for i, (Helix, num) in enumerate(zip(Insert.helices, offsets)):
 
         hname = psnames[num].replace("_Cu0", "")
         hdefs = helix_bcs(Helix, hname, (H_ids[i], ()), debug)
@@ -225,8 +213,6 @@ def gmsh_bcs(
         if i == NHelices - 1:
             bcs_defs[f"{hname}_BP"] = [Helix.r[0], Helix.z[0], Helix.r[1], Helix.z[0]]
 
-        num += len(Helix.modelaxi.turns) + 2
-
     # loop over Rings
     for i, Ring in enumerate(Insert.rings):
 
@@ -234,10 +220,9 @@ def gmsh_bcs(
         if i % 2 != 0:
             y -= Ring.z[-1] - Ring.z[0]
 
-        rname = psnames[num]
+        rname = psnames[offsets[-1] + i]
         rdefs = ring_bcs(Ring, rname, (i % 2 != 0), y, R_ids[i], debug)
         defs.update(rdefs)
-        num += 1
 
     if AirData:
         (Air_id, dr_air, z0_air, dz_air) = AirData
@@ -246,8 +231,6 @@ def gmsh_bcs(
         gmsh.model.setPhysicalName(2, ps, "Air")
         defs["Air"] = ps
         # TODO: Axis, Inf
-        gmsh.option.setNumber("Geometry.OCCBoundsUseStl", 1)
-
         bcs_defs["ZAxis"] = [0, z0_air, 0, z0_air + dz_air]
         bcs_defs["Infty"] = [
             [0, z0_air, dr_air, z0_air],
@@ -255,12 +238,12 @@ def gmsh_bcs(
             [0, z0_air + dz_air, dr_air, z0_air + dz_air],
         ]
 
-    for key in bcs_defs:
-        defs[key] = create_bcs(key, bcs_defs[key], 1)
+    defs.update(create_bcs_batch(bcs_defs, 1))
     gmsh.model.occ.synchronize()
 
     # Group bcs by Channels
     Channels = Insert.get_channels(mname, False, debug)
+    obsolete = []
     for i, channel in enumerate(Channels):
         print(f"Channel{i}: {channel}")
         tags = []
@@ -270,18 +253,22 @@ def gmsh_bcs(
                 vEntities = gmsh.model.getEntitiesForPhysicalGroup(1, defs[bc])
                 # print(f"{bc}: vEntites={type(vEntities)}, tolist={vEntities.tolist()}")
                 if isinstance(vEntities, ndarray):
-                    tags += vEntities.tolist()
+                    tags.append(vEntities)
                 else:
                     raise RuntimeError(f"vEntities: {type(vEntities)} unsupported type")
 
         # print(f"{channel}: {tags}")
+        tags = np.concatenate(tags).tolist() if tags else []
         ps = gmsh.model.addPhysicalGroup(1, tags)
         gmsh.model.setPhysicalName(1, ps, f"{prefix}Channel{i}")
         defs[f"{prefix}Channel{i}"] = ps
 
         for bc in channel:
             if bc in defs:
-                gmsh.model.removePhysicalGroups([(1, defs[bc])])
-                del defs[bc]
+                obsolete.append((1, defs.pop(bc)))
+
+    # remove grouped bcs in a single call
+    if obsolete:
+        gmsh.model.removePhysicalGroups(obsolete)
 
     return defs
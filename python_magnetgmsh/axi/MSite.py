@@ -7,7 +7,6 @@ Provides definition for Site:
 """
 
 import gmsh
-import yaml
 
 from python_magnetgeo import Insert
 from python_magnetgeo import Bitter
@@ -15,8 +14,9 @@ from python_magnetgeo import Bitters
 from python_magnetgeo import Supra
 from python_magnetgeo import Supras
 from python_magnetgeo import Screen
-from ..mesh.bcs import create_bcs
+from ..mesh.bcs import create_bcs_batch
 from ..utils.lists import flatten
+from ..utils.modules import load_module
 from ..logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -35,12 +35,11 @@ def gmsh_box(MSite, debug: bool = False) -> list:
     get boundingbox for each channel
     """
     print(f"gmsh_box: MSite={MSite.name}")
-    from importlib import import_module
 
     boxes = []
 
     for magnet in MSite.magnets:
-        MyMagnet = import_module(import_dict[type(magnet)], package="python_magnetgmsh")
+        MyMagnet = load_module(import_dict[type(magnet)])
         box = MyMagnet.gmsh_box(magnet, debug)
         boxes.append(box)
 
@@ -51,7 +50,6 @@ def gmsh_ids(MSite, AirData: tuple, thickslit: bool = False, debug: bool = False
     """
     create gmsh geometry
     """
-    from importlib import import_module
 
     print(f"gmsh_ids: MSite={MSite.name}")
 
@@ -59,7 +57,7 @@ def gmsh_ids(MSite, AirData: tuple, thickslit: bool = False, debug: bool = False
 
     for magnet in MSite.magnets:
         # print(f"msite/gmsh/{mname} (dict/list)")
-        MyMagnet = import_module(import_dict[type(magnet)], package="python_magnetgmsh")
+        MyMagnet = load_module(import_dict[type(magnet)])
         ids = MyMagnet.gmsh_ids(magnet, (), thickslit, debug)
         gmsh_ids.append(ids)
         # print(f"ids[{mname}]: {ids} (type={type(ids)})")
@@ -88,8 +86,7 @@ def gmsh_ids(MSite, AirData: tuple, thickslit: bool = False, debug: bool = False
             # since sublist[0] contains id for Face
             # and sublist[1] ................. edge (aka cracks for Bitters with thin cooling slits)
             # but sublist[1] ................. Rings for insert !!!
-            flat_list += flatten(sublist[0])
-            flat_list += flatten(sublist[1])
+            flat_list += flatten([sublist[0], sublist[1]])
             """
             for elem in flatten(sublist[0]) + flatten(sublist[1]):            
                 # print("elem:", elem, type(elem))
@@ -125,7 +122,6 @@ def gmsh_bcs(
     """
     retreive ids for bcs in gmsh geometry
     """
-    from importlib import import_module
 
     print(f"gmsh_ids: MSite={MSite.name}")
 
@@ -138,7 +134,7 @@ def gmsh_bcs(
     num = 0
 
     for j, magnet in enumerate(MSite.magnets):
-        MyMagnet = import_module(import_dict[type(magnet)], package="python_magnetgmsh")
+        MyMagnet = load_module(import_dict[type(magnet)])
         tdefs = MyMagnet.gmsh_bcs(magnet, f"{magnet.name}", gmsh_ids[num], thickslit, debug)
         defs.update(tdefs)
         num += 1
@@ -153,8 +149,6 @@ def gmsh_bcs(
         gmsh.model.setPhysicalName(2, ps, "Air")
         defs["Air"] = ps
         # TODO: Axis, Inf
-        gmsh.option.setNumber("Geometry.OCCBoundsUseStl", 1)
-
         bcs_defs["ZAxis"] = [0, z0_air, 0, z0_air + dz_air]
         bcs_defs["Infty"] = [
             [0, z0_air, dr_air, z0_air],
@@ -162,7 +156,6 @@ def gmsh_bcs(
             [0, z0_air + dz_air, dr_air, z0_air + dz_air],
         ]
 
-    for key in bcs_defs:
-        defs[key] = create_bcs(key, bcs_defs[key], 1)
+    defs.update(create_bcs_batch(bcs_defs, 1))
 
     return defs
@@ -7,7 +7,7 @@ Provides definition for Ring:
 """
 from python_magnetgeo.Ring import Ring
 import gmsh
-from ..mesh.bcs import create_bcs
+from ..mesh.bcs import create_bcs_batch
 
 
 def gmsh_ids(Ring: Ring, y: float, debug: bool = False) -> int:
@@ -43,8 +43,6 @@ def gmsh_bcs(Ring: Ring, mname: str, hp: bool, y: float, id: int, debug: bool =
         defs[f"{Ring.name}"] = ps
 
     # get BC (TODO review to keep on BP or HP)
-    gmsh.option.setNumber("Geometry.OCCBoundsUseStl", 1)
-
     bcs_defs = {}
     if hp:
         bcs_defs[f"{prefix}HP"] = [
@@ -104,7 +102,6 @@ def gmsh_bcs(Ring: Ring, mname: str, hp: bool, y: float, id: int, debug: bool =
             (y + Ring.z[-1]),
         ]
 
-    for key in bcs_defs:
-        defs[key] = create_bcs(key, bcs_defs[key], 1)
+    defs.update(create_bcs_batch(bcs_defs, 1))
 
     return defs
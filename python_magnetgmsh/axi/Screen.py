@@ -9,7 +9,7 @@ Provides definition for Screen:
 from python_magnetgeo.Screen import Screen
 
 import gmsh
-from ..mesh.bcs import create_bcs
+from ..mesh.bcs import create_bcs_batch
 
 
 def gmsh_box(Screen: Screen, debug: bool = False) -> list:
@@ -68,8 +68,6 @@ def gmsh_bcs(Screen: Screen, ids: tuple, debug: bool = False) -> dict:
     defs["%s_S" % Screen.name] = ps
 
     # get BC ids
-    gmsh.option.setNumber("Geometry.OCCBoundsUseStl", 1)
-
     bcs_defs = {
         f"{Screen.name}_HP": [Screen.r[0], Screen.z[0], Screen.r[-1], Screen.z[0]],
         f"{Screen.name}_BP": [Screen.r[0], Screen.z[-1], Screen.r[-1], Screen.z[-1]],
@@ -85,8 +83,6 @@ def gmsh_bcs(Screen: Screen, ids: tuple, debug: bool = False) -> dict:
         gmsh.model.setPhysicalName(2, ps, "Air")
         defs["Air"] = ps
         # TODO: Axis, Inf
-        gmsh.option.setNumber("Geometry.OCCBoundsUseStl", 1)
-
         bcs_defs["ZAxis"] = [0, z0_air, 0, z0_air + dz_air]
         bcs_defs["Infty"] = [
             [0, z0_air, dr_air, z0_air],
@@ -94,7 +90,6 @@ def gmsh_bcs(Screen: Screen, ids: tuple, debug: bool = False) -> dict:
             [0, z0_air + dz_air, dr_air, z0_air + dz_air],
         ]
 
-    for key in bcs_defs:
-        defs[key] = create_bcs(key, bcs_defs[key], 1)
+    defs.update(create_bcs_batch(bcs_defs, 1))
 
     return defs
@@ -15,8 +15,9 @@ from python_magnetgeo.Supra import Supra
 from python_magnetgeo.SupraStructure import HTSInsert
 from python_magnetgeo.enums import DetailLevel
 
-from ..mesh.bcs import create_bcs
+from ..mesh.bcs import create_bcs_batch
 from .SupraStructure import insert_ids, insert_bcs
+from .Air import gmsh_air
 from ..logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -50,8 +51,6 @@ def gmsh_ids(Supra: Supra, AirData: tuple, Thickslit: bool = False, debug: bool
         # Now create air
         Air_data = ()
         if AirData:
-            from .Air import gmsh_air
-
             (r0_air, z0_air, dr_air, dz_air) = gmsh_air(Supra, AirData)
             A_id = gmsh.model.occ.addRectangle(r0_air, z0_air, 0, dr_air, dz_air)
 
@@ -99,8 +98,6 @@ def gmsh_bcs(
         # print(f"{Supra.name}: {id}")
 
         # get BC ids
-        gmsh.option.setNumber("Geometry.OCCBoundsUseStl", 1)
-
         bcs_defs[f"{prefix}HP"] = [Supra.r[0], Supra.z[0], Supra.r[-1], Supra.z[0]]
         bcs_defs[f"{prefix}BP"] = [
             Supra.r[0],
@@ -119,8 +116,6 @@ def gmsh_bcs(
             gmsh.model.setPhysicalName(2, ps, "Air")
             defs["Air"] = ps
             # TODO: Axis, Inf
-            gmsh.option.setNumber("Geometry.OCCBoundsUseStl", 1)
-
             bcs_defs["ZAxis"] = [0, z0_air, 0, z0_air + dz_air]
             bcs_defs["Infty"] = [
                 [0, z0_air, dr_air, z0_air],
@@ -135,7 +130,6 @@ def gmsh_bcs(
         # call gmsh for struct
         defs = insert_bcs(nougat, mname, Supra.detail, ids, debug)
 
-    for key in bcs_defs:
-        defs[key] = create_bcs(key, bcs_defs[key], 1)
+    defs.update(create_bcs_batch(bcs_defs, 1))
 
     return defs
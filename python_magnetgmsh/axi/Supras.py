@@ -2,11 +2,13 @@
 # encoding: UTF-8
 
 """defines Supra Insert structure"""
-import yaml
+
+import gmsh
 
 from python_magnetgeo.Supra import Supra
 from python_magnetgeo.Supras import Supras
 from ..utils.lists import flatten
+from ..utils.modules import load_module
 from ..logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -19,12 +21,11 @@ def gmsh_box(Supras: Supras, debug: bool = False) -> list:
     get boundingbox for each slit
     """
     logger.debug("Creating bounding boxes for Supras")
-    from importlib import import_module
 
     boxes = []
 
     for magnet in Supras.magnets:
-        MyMagnet = import_module(import_dict[type(magnet)], package="python_magnetgmsh")
+        MyMagnet = load_module(import_dict[type(magnet)])
         box = MyMagnet.gmsh_box(magnet, debug)
         logger.debug(f"Supras {magnet.name} bounding box: {box}")
         boxes.append(box)
@@ -36,13 +37,11 @@ def gmsh_ids(Supras: Supras, AirData: tuple, thickslit: bool = False, debug: boo
     """
     create gmsh geometry
     """
-    import gmsh
-    from importlib import import_module
 
     gmsh_ids = []
 
     for magnet in Supras.magnets:
-        MyMagnet = import_module(import_dict[type(magnet)], package="python_magnetgmsh")
+        MyMagnet = load_module(import_dict[type(magnet)])
         ids = MyMagnet.gmsh_ids(magnet, (), thickslit, debug)
         gmsh_ids.append(ids)
 
@@ -92,8 +91,6 @@ def gmsh_bcs(Supras, mname: str, ids: tuple, thickslit: bool = False, debug: boo
     """
     retreive ids for bcs in gmsh geometry
     """
-    import gmsh
-    from importlib import import_module
 
     logger.debug(f"Creating boundary conditions for Supras: {Supras.name}")
     (gmsh_ids, gmsh_bc_ids, Air_data) = ids
@@ -106,7 +103,7 @@ def gmsh_bcs(Supras, mname: str, ids: tuple, thickslit: bool = False, debug: boo
     for i, magnet in enumerate(Supras.magnets):
         # print(f"Supras/gmsh/{mname} (dict/list)")
         # print(f"gmsh_ids[{key}]: {gmsh_ids[num]}")
-        MyMagnet = import_module(import_dict[type(magnet)], package="python_magnetgmsh")
+        MyMagnet = load_module(import_dict[type(magnet)])
         tdefs = MyMagnet.gmsh_bcs(
             magnet, f"{Supras.name}_{magnet.name}", gmsh_ids[num], thickslit, debug
         )
@@ -83,9 +83,10 @@ from .argparse_utils import (
     add_algo2d_arg,
     add_scaling_arg,
     add_lc_arg,
+    add_threads_arg,
 )
 from .logging_config import setup_logging
-from .mesh.axi import get_allowed_algo, gmsh_msh, gmsh_cracks
+from .mesh.axi import get_allowed_algo, gmsh_msh, gmsh_cracks, set_threads
 
 logger = logging.getLogger(__name__)
 
@@ -221,6 +222,7 @@ def main():
     add_algo2d_arg(parser, get_allowed_algo())
     add_scaling_arg(parser)
     add_lc_arg(parser)
+    add_threads_arg(parser)
 
     add_show_arg(parser)
     add_common_args(parser)
@@ -332,6 +334,8 @@ def main():
         yamlfile += "_gmshaxidata"
         meshAxiData = createMeshAxiData(prefix, Object, AirData, yamlfile, args.algo2d)
 
+        if args.threads:
+            set_threads(args.threads)
         gmsh_msh(args.algo2d, meshAxiData, boxes, air, args.scaling)
         if not args.thickslit:
             gmsh_cracks(args.debug)
@@ -1,8 +1,11 @@
 import os
 import sys
 import logging
+from itertools import chain
+from math import pi, cos, sin
 
 import gmsh
+import numpy as np
 
 # Lazy loading import - automatically detects geometry type
 from python_magnetgeo.utils import getObject
@@ -18,9 +21,10 @@ from ..argparse_utils import (
     add_show_arg,
     add_algo2d_arg,
     add_scaling_arg,
+    add_threads_arg,
 )
-from ..utils.lists import flatten
-from ..mesh.axi import get_allowed_algo, MeshAlgo2D
+from ..mesh.axi import get_allowed_algo, MeshAlgo2D, set_threads
+from ..mesh.fields import threshold_field
 
 logger = logging.getLogger(__name__)
 
@@ -39,19 +43,13 @@ def create_contour2d(x: float, y: float, contour2d: Contour2D):
         _cl = gmsh.model.occ.addCurveLoop([curv])
         logger.debug(f"create a circle: C({x},{y}), r={r}, _cl={_cl}, curv={curv}")
     else:
-        curv = []
-        points = []
-        for i, pt in enumerate(contour2d.points):
-            logger.debug(f"pt[{i}]: {pt}")
-            points.append(gmsh.model.occ.addPoint(x + pt[0], pt[1], 0))
-            logger.debug(f"addPoint({x + pt[0]}, {pt[1]})")
-            if i >= 1:
-                curv.append(gmsh.model.occ.addLine(points[i - 1], points[i]))
-        curv.append(gmsh.model.occ.addLine(points[-1], points[0]))
+        _addPoint = gmsh.model.occ.addPoint
+        _addLine = gmsh.model.occ.addLine
+        points = [_addPoint(x + pt[0], pt[1], 0) for pt in contour2d.points]
+        logger.debug(f"create_contour2d: points={points}")
+        curv = [_addLine(p0, p1) for p0, p1 in zip(points, points[1:] + points[:1])]
         _cl = gmsh.model.occ.addCurveLoop(curv)
         logger.debug(f"create_contour2d: _cl={_cl}, {curv}")
-        curv.clear()
-        points.clear()
     return _cl
 
 
@@ -61,33 +59,32 @@ def gmsh2D_ids(Bitter: Bitter.Bitter, AirData: tuple, debug: bool = False) -> tu
     """
     logger.info("Creating Bitter 2D geometry")
 
-    from math import pi, cos, sin
+    # bind occ functions once, they are called in the slit loops below
+    _addPlaneSurface = gmsh.model.occ.addPlaneSurface
+    _copy = gmsh.model.occ.copy
+    _rotate = gmsh.model.occ.rotate
 
     theta = 2 * pi / 32.0
     if Bitter.tierod:
         tierod = Bitter.tierod
         theta = 2 * pi / float(tierod.n)
 
+    # half sector angle, sin(-theta/2) = -sin_t
+    cos_t, sin_t = cos(theta / 2.0), sin(theta / 2.0)
+    r0, r1 = Bitter.r[0], Bitter.r[1]
+
     Origin = gmsh.model.occ.addPoint(0, 0, 0)
 
     # Bitter sector
     curv = []
-    pt0_r0 = gmsh.model.occ.addPoint(
-        Bitter.r[0] * cos(-theta / 2.0), Bitter.r[0] * sin(-theta / 2.0), 0
-    )
-    pt1_r0 = gmsh.model.occ.addPoint(
-        Bitter.r[0] * cos(theta / 2.0), Bitter.r[0] * sin(theta / 2.0), 0
-    )
+    pt0_r0 = gmsh.model.occ.addPoint(r0 * cos_t, -r0 * sin_t, 0)
+    pt1_r0 = gmsh.model.occ.addPoint(r0 * cos_t, r0 * sin_t, 0)
     rint_id = gmsh.model.occ.addCircleArc(pt0_r0, Origin, pt1_r0)
     logger.debug(f"rint_id={rint_id}")
     curv.append(rint_id)
 
-    pt0_r1 = gmsh.model.occ.addPoint(
-        Bitter.r[1] * cos(-theta / 2.0), Bitter.r[1] * sin(-theta / 2.0), 0
-    )
-    pt1_r1 = gmsh.model.occ.addPoint(
-        Bitter.r[1] * cos(theta / 2.0), Bitter.r[1] * sin(theta / 2.0), 0
-    )
+    pt0_r1 = gmsh.model.occ.addPoint(r1 * cos_t, -r1 * sin_t, 0)
+    pt1_r1 = gmsh.model.occ.addPoint(r1 * cos_t, r1 * sin_t, 0)
     curv.append(gmsh.model.occ.addLine(pt0_r0, pt0_r1))
     rext_id = gmsh.model.occ.addCircleArc(pt0_r1, Origin, pt1_r1)
     logger.debug(f"rext_id={rext_id}")
@@ -100,6 +97,7 @@ def gmsh2D_ids(Bitter: Bitter.Bitter, AirData: tuple, debug: bool = False) -> tu
 
     holes = []
     names = []
+    obsolete_slits = []
     if Bitter.tierod:
         _ltierod = create_contour2d(tierod.r, 0, tierod.contour2d)
         logger.debug(f"_ltierod: {_ltierod}")
@@ -124,9 +122,9 @@ def gmsh2D_ids(Bitter: Bitter.Bitter, AirData: tuple, debug: bool = False) -> tu
 
             # create contour2d for slit
             _lc = create_contour2d(x=slit.r, y=0, contour2d=slit.contour2d)
-            slit_id = gmsh.model.occ.addPlaneSurface([_lc])
+            slit_id = _addPlaneSurface([_lc])
             if angle != 0:
-                gmsh.model.occ.rotate([(2, slit_id)], 0, 0, 0, 0, 0, 1, angle)
+                _rotate([(2, slit_id)], 0, 0, 0, 0, 0, 1, angle)
                 logger.debug(f"slit[{j+1}][0]: rotate {angle} init")
 
             if Bitter.tierod and (slit.r == tierod.r and angle == 0):
@@ -135,15 +133,15 @@ def gmsh2D_ids(Bitter: Bitter.Bitter, AirData: tuple, debug: bool = False) -> tu
                 holes.append(slit_id)
                 _names.append(f"slit{j+1}_0")
 
-            for n in range(1, nslits):
-                if (
-                    n * theta_s + angle <= theta / 2.0
-                    or n * theta_s + angle >= 2 * pi - theta / 2.0
-                ):
-                    res = gmsh.model.occ.copy([(2, slit_id)])
-                    # print(f"res={res}")
-                    _id = res[0][1]
-                    gmsh.model.occ.rotate([(2, _id)], 0, 0, 0, 0, 0, 1, n * theta_s)
+            # copy the slit once for all kept positions, then rotate each copy
+            ns = np.arange(1, nslits)
+            angles = ns * theta_s + angle
+            keep = (angles <= theta / 2.0) | (angles >= 2 * pi - theta / 2.0)
+            kept = ns[keep].tolist()
+            if kept:
+                res = _copy([(2, slit_id)] * len(kept))
+                for n, (_, _id) in zip(kept, res):
+                    _rotate([(2, _id)], 0, 0, 0, 0, 0, 1, n * theta_s)
                     holes.append(_id)
                     _names.append(f"slit{j+1}_{n}")
 
@@ -151,8 +149,11 @@ def gmsh2D_ids(Bitter: Bitter.Bitter, AirData: tuple, debug: bool = False) -> tu
 
             if Bitter.tierod and (slit.r == tierod.r and angle == 0):
                 logger.debug(f"remove slit{j+1}_0: {slit_id}")
-                gmsh.model.occ.remove([(2, slit_id)], recursive=True)
-                gmsh.model.occ.synchronize()
+                obsolete_slits.append(slit_id)
+
+    # remove slits overlapping the tierod in a single call
+    if obsolete_slits:
+        gmsh.model.occ.remove([(2, _id) for _id in obsolete_slits], recursive=True)
 
     logger.debug(f"holes={holes}")
     logger.debug(f"names={names}")
@@ -203,100 +204,52 @@ def gmsh2D_ids(Bitter: Bitter.Bitter, AirData: tuple, debug: bool = False) -> tu
     else:
         tierod_ids = create_bcgroup(cad[0][0][1], tierod_id, "tierod")
 
-    slit_names = flatten(names)
+    slit_names = list(chain.from_iterable(names))
     logger.debug(f"slit_names: {len(slit_names)} names, {len(holes)} slits")
     hole_ids = []
     for i in range(1, len(holes)):
         _ids = create_bcgroup(cad[0][0][1], holes[i], slit_names[i - 1])
         hole_ids.append(_ids)
-    for hole in holes:
-        gmsh.model.occ.remove([(2, hole)])
+    gmsh.model.occ.remove([(2, hole) for hole in holes])
     gmsh.model.occ.synchronize()
+    flat_hole_ids = list(chain.from_iterable(hole_ids))
 
     # TODO physical for Rint, Rext, V0, V1
     eps = 0.1
-    xmin = Bitter.r[0] * cos(-theta / 2.0) - eps
-    ymin = Bitter.r[0] * sin(-theta / 2.0) - eps
-    xmax = Bitter.r[0] + eps
-    ymax = Bitter.r[0] * sin(theta / 2.0) + eps
-    candidate_rint = gmsh.model.getEntitiesInBoundingBox(
-        xmin,
-        ymin,
-        -eps,
-        xmax,
-        ymax,
-        eps,
-        1,
-    )
-    candidate_rint_ids = [tag[1] for tag in candidate_rint]
-    logger.debug(f"candidate_rint={candidate_rint} xmin={xmin} ymin={ymin} xmax={xmax}, ymax={ymax}")
-    xmin = Bitter.r[1] * cos(-theta / 2.0) - eps
-    ymin = Bitter.r[1] * sin(-theta / 2.0) - eps
-    xmax = Bitter.r[1] + eps
-    ymax = Bitter.r[1] * sin(theta / 2.0) + eps
-    candidate_rext = gmsh.model.getEntitiesInBoundingBox(
-        xmin,
-        ymin,
-        -eps,
-        xmax,
-        ymax,
-        eps,
-        1,
-    )
-    candidate_rext_ids = [tag[1] for tag in candidate_rext]
-    logger.debug(f"candidate_rext={candidate_rext} xmin={xmin} ymin={ymin} xmax={xmax}, ymax={ymax}")
-    xmin = Bitter.r[0] * cos(-theta / 2.0) - eps
-    ymin = Bitter.r[1] * sin(-theta / 2.0) - eps
-    xmax = Bitter.r[1] * cos(-theta / 2.0) + eps
-    ymax = Bitter.r[0] * sin(-theta / 2.0) + eps
-    candidate_V0 = gmsh.model.getEntitiesInBoundingBox(
-        xmin,
-        ymin,
-        -eps,
-        xmax,
-        ymax,
-        eps,
-        1,
-    )
-    candidate_V0_ids = [tag[1] for tag in candidate_V0]
-    logger.debug(f"candidate_V0={candidate_V0} xmin={xmin} ymin={ymin} xmax={xmax}, ymax={ymax}")
-    xmin = Bitter.r[0] * cos(theta / 2.0) - eps
-    ymin = Bitter.r[0] * sin(theta / 2.0) - eps
-    xmax = Bitter.r[1] * cos(theta / 2.0) + eps
-    ymax = Bitter.r[1] * sin(theta / 2.0) + eps
-    candidate_V1 = gmsh.model.getEntitiesInBoundingBox(
-        xmin,
-        ymin,
-        -eps,
-        xmax,
-        ymax,
-        eps,
-        1,
-    )
-    candidate_V1_ids = [tag[1] for tag in candidate_V1]
-    logger.debug(f"candidate_V1={candidate_V1} xmin={xmin} ymin={ymin} xmax={xmax}, ymax={ymax}")
-
-    _ids = flatten(hole_ids) + tierod_ids
+    # candidate boxes [xmin, ymin, xmax, ymax] for Rint, Rext, V0 and V1
+    boxes = np.array(
+        [
+            [r0 * cos_t, -r0 * sin_t, r0, r0 * sin_t],
+            [r1 * cos_t, -r1 * sin_t, r1, r1 * sin_t],
+            [r0 * cos_t, -r1 * sin_t, r1 * cos_t, -r0 * sin_t],
+            [r0 * cos_t, r0 * sin_t, r1 * cos_t, r1 * sin_t],
+        ]
+    ) + np.array([-eps, -eps, eps, eps])
+
+    # tag -> boundaries whose candidate box contains it
+    bcs_of: dict[int, list[str]] = {}
+    for bc, (xmin, ymin, xmax, ymax) in zip(["rint", "rext", "V0", "V1"], boxes.tolist()):
+        candidate = gmsh.model.getEntitiesInBoundingBox(xmin, ymin, -eps, xmax, ymax, eps, 1)
+        for tag in candidate:
+            bcs_of.setdefault(tag[1], []).append(bc)
+        logger.debug(f"candidate_{bc}={candidate} xmin={xmin} ymin={ymin} xmax={xmax}, ymax={ymax}")
+
+    # only candidate curves of the expected type are kept
+    bc_type = {"rint": "Circle", "rext": "Circle", "V0": "Line", "V1": "Line"}
+    bc_ids: dict[str, list[int]] = {bc: [] for bc in bc_type}
+    _ids = set(flat_hole_ids + tierod_ids)
     vEntities = gmsh.model.getEntities(1)
-    rint_ids = []
-    rext_ids = []
-    V0_ids = []
-    V1_ids = []
     for i, entity in enumerate(vEntities):
         tag = entity[1]
-        if entity[1] not in _ids:
-            gtype = gmsh.model.getType(entity[0], entity[1])
-            logger.debug(f"Line[{i}]: id={tag}, type={gtype}")
-            if gtype == "Circle":
-                if tag in candidate_rint_ids:
-                    rint_ids.append(tag)
-                if tag in candidate_rext_ids:
-                    rext_ids.append(tag)
-            elif gtype == "Line":
-                if tag in candidate_V0_ids:
-                    V0_ids.append(tag)
-                if tag in candidate_V1_ids:
-                    V1_ids.append(tag)
+        bcs = bcs_of.get(tag)
+        if bcs is None or tag in _ids:
+            continue
+        gtype = gmsh.model.getType(entity[0], entity[1])
+        logger.debug(f"Line[{i}]: id={tag}, type={gtype}")
+        for bc in bcs:
+            if gtype == bc_type[bc]:
+                bc_ids[bc].append(tag)
+    (rint_ids, rext_ids, V0_ids, V1_ids) = bc_ids.values()
 
     ps = gmsh.model.addPhysicalGroup(1, rint_ids)
     gmsh.model.setPhysicalName(1, ps, "slit0")
@@ -314,14 +267,14 @@ def gmsh2D_ids(Bitter: Bitter.Bitter, AirData: tuple, debug: bool = False) -> tu
         return (
             [cad],
             (rint_ids + rext_ids + V0_ids + V1_ids),
-            flatten(hole_ids),
+            flat_hole_ids,
             tierod_ids,
         )
     else:
         return (
             [cad[1][0][0][1]],
             (rint_ids + rext_ids + V0_ids + V1_ids),
-            flatten(hole_ids),
+            flat_hole_ids,
             tierod_ids,
         )
 
@@ -337,6 +290,7 @@ def main():
     parser.add_argument("--mesh", help="activate mesh", action="store_true")
     add_algo2d_arg(parser, get_allowed_algo())
     add_scaling_arg(parser)
+    add_threads_arg(parser)
     parser.add_argument("--lc", help="specify mesh size", type=float, default="10")
     add_show_arg(parser)
     add_common_args(parser)
@@ -374,6 +328,8 @@ def main():
     if args.mesh:
         logger.info(f"create Axi Gmsh mesh ({args.algo2d})")
         gmsh.option.setNumber("Mesh.Algorithm", MeshAlgo2D[args.algo2d])
+        if args.threads:
+            set_threads(args.threads)
 
         # scaling
         unit = 1
@@ -387,45 +343,37 @@ def main():
         dfields = []
         nfield = 0
 
-        # Rint/Rext
-        for bc in result[1]:
-            gmsh.model.mesh.field.add("Distance", nfield)
-            gmsh.model.mesh.field.setNumbers(nfield, "CurvesList", [bc])
-            gmsh.model.mesh.field.setNumbers(nfield, "Sampling", [100])
-            nfield += 1
+        # one Distance/Threshold pair per group of curves:
+        # Min over per-curve Thresholds equals one Threshold on the distance to all curves
 
-            # Field 2: Threshold that dictates the mesh size of the background field
+        # Rint/Rext
+        if result[1]:
+            nfield = threshold_field(
+                nfield,
+                list(result[1]),
+                args.lc / 10.0 * unit,
+                args.lc * unit,
+                10 * unit,
+                12.5 * unit,
+            )
             logger.debug(f"Field[Thresold] for Rint/Rext: {nfield}")
-            gmsh.model.mesh.field.add("Threshold", nfield)
-            gmsh.model.mesh.field.setNumber(nfield, "IField", nfield - 1)
-            gmsh.model.mesh.field.setNumber(nfield, "LcMin", args.lc / 10.0 * unit)
-            gmsh.model.mesh.field.setNumber(nfield, "LcMax", args.lc * unit)
-            gmsh.model.mesh.field.setNumber(nfield, "DistMin", 10 * unit)
-            gmsh.model.mesh.field.setNumber(nfield, "DistMax", 12.5 * unit)
-            gmsh.model.mesh.field.setNumber(nfield, "StopAtDistMax", True)
             dfields.append(nfield)
             nfield += 1
 
         # Tierod
-        if Object.tierod:
+        if Object.tierod and result[3]:
             r_tierod = min(0.5, Object.tierod.r)
-            for bc in result[3]:
-                gmsh.model.mesh.field.add("Distance", nfield)
-                gmsh.model.mesh.field.setNumbers(nfield, "CurvesList", [bc])
-                gmsh.model.mesh.field.setNumbers(nfield, "Sampling", [100])
-                nfield += 1
-
-                # Field 2: Threshold that dictates the mesh size of the background field
-                logger.debug(f"Field[Thresold] for cooling holes: {nfield}")
-                gmsh.model.mesh.field.add("Threshold", nfield)
-                gmsh.model.mesh.field.setNumber(nfield, "IField", nfield - 1)
-                gmsh.model.mesh.field.setNumber(nfield, "LcMin", args.lc / 20.0 * unit)
-                gmsh.model.mesh.field.setNumber(nfield, "LcMax", args.lc * unit)
-                gmsh.model.mesh.field.setNumber(nfield, "DistMin", r_tierod * unit)
-                gmsh.model.mesh.field.setNumber(nfield, "DistMax", 1.1 * r_tierod * unit)
-                gmsh.model.mesh.field.setNumber(nfield, "StopAtDistMax", True)
-                dfields.append(nfield)
-                nfield += 1
+            nfield = threshold_field(
+                nfield,
+                list(result[3]),
+                args.lc / 20.0 * unit,
+                args.lc * unit,
+                r_tierod * unit,
+                1.1 * r_tierod * unit,
+            )
+            logger.debug(f"Field[Thresold] for cooling holes: {nfield}")
+            dfields.append(nfield)
+            nfield += 1
 
         # Cooling holes
         lst = []
@@ -433,31 +381,27 @@ def main():
         if Object.coolingslits:
             lst = [slit.dh for slit in Object.coolingslits]
             r_holes = min(2, sum(lst) / len(lst))
-        for bc in result[2]:
-            gmsh.model.mesh.field.add("Distance", nfield)
-            gmsh.model.mesh.field.setNumbers(nfield, "CurvesList", [bc])
-            gmsh.model.mesh.field.setNumbers(nfield, "Sampling", [100])
-            nfield += 1
-
-            # Field 2: Threshold that dictates the mesh size of the background field
+        if result[2]:
+            nfield = threshold_field(
+                nfield,
+                list(result[2]),
+                args.lc / 40.0 * unit,
+                args.lc * unit,
+                r_holes * unit,
+                1.02 * r_holes * unit,
+            )
             logger.debug(f"Field[Thresold] for cooling holes: {nfield}")
-            gmsh.model.mesh.field.add("Threshold", nfield)
-            gmsh.model.mesh.field.setNumber(nfield, "IField", nfield - 1)
-            gmsh.model.mesh.field.setNumber(nfield, "LcMin", args.lc / 40.0 * unit)
-            gmsh.model.mesh.field.setNumber(nfield, "LcMax", args.lc * unit)
-            gmsh.model.mesh.field.setNumber(nfield, "DistMin", r_holes * unit)
-            gmsh.model.mesh.field.setNumber(nfield, "DistMax", 1.02 * r_holes * unit)
-            gmsh.model.mesh.field.setNumber(nfield, "StopAtDistMax", True)
             dfields.append(nfield)
             nfield += 1
 
         # Let's use the minimum of all the fields as the mesh size field:
-        gmsh.model.mesh.field.add("Min", nfield)
-        gmsh.model.mesh.field.setNumbers(nfield, "FieldsList", dfields)  # dfields
-        logger.debug(f"Field[Min] = {nfield}, Min=[{dfields[0]},...,{dfields[-1]}]")
+        if dfields:
+            gmsh.model.mesh.field.add("Min", nfield)
+            gmsh.model.mesh.field.setNumbers(nfield, "FieldsList", dfields)  # dfields
+            logger.debug(f"Field[Min] = {nfield}, Min=[{dfields[0]},...,{dfields[-1]}]")
 
-        logger.info(f"Apply background mesh {nfield}")
-        gmsh.model.mesh.field.setAsBackgroundMesh(nfield)
+            logger.info(f"Apply background mesh {nfield}")
+            gmsh.model.mesh.field.setAsBackgroundMesh(nfield)
 
         gmsh.model.mesh.generate(2)
 
@@ -1,6 +1,7 @@
 import os
 import sys
 import logging
+from math import pi, cos, sin
 
 import gmsh
 
@@ -18,9 +19,11 @@ from ..argparse_utils import (
     add_show_arg,
     add_algo2d_arg,
     add_scaling_arg,
+    add_threads_arg,
 )
 from ..utils.lists import flatten
-from ..mesh.axi import get_allowed_algo, MeshAlgo2D
+from ..mesh.axi import get_allowed_algo, MeshAlgo2D, set_threads
+from ..mesh.fields import threshold_field
 
 logger = logging.getLogger(__name__)
 
@@ -39,19 +42,13 @@ def create_contour2d(x: float, y: float, contour2d: Contour2D):
         _cl = gmsh.model.occ.addCurveLoop([curv])
         logger.debug(f"create a circle: C({x},{y}), r={r}, _cl={_cl}, curv={curv}")
     else:
-        curv = []
-        points = []
-        for i, pt in enumerate(contour2d.points):
-            logger.debug(f"pt[{i}]: {pt}")
-            points.append(gmsh.model.occ.addPoint(x + pt[0], y + pt[1], 0))
-            logger.debug(f"addPoint({x + pt[0]}, {y+pt[1]})")
-            if i >= 1:
-                curv.append(gmsh.model.occ.addLine(points[i - 1], points[i]))
-        curv.append(gmsh.model.occ.addLine(points[-1], points[0]))
+        _addPoint = gmsh.model.occ.addPoint
+        _addLine = gmsh.model.occ.addLine
+        points = [_addPoint(x + pt[0], y + pt[1], 0) for pt in contour2d.points]
+        logger.debug(f"create_contour2d: points={points}")
+        curv = [_addLine(p0, p1) for p0, p1 in zip(points, points[1:] + points[:1])]
         _cl = gmsh.model.occ.addCurveLoop(curv)
         logger.debug(f"create_contour2d: _cl={_cl}, {curv}")
-        curv.clear()
-        points.clear()
     return _cl
 
 
@@ -61,8 +58,6 @@ def gmsh2D_ids(Bitter: Bitter.Bitter, AirData: tuple, debug: bool = False) -> tu
     """
     logger.info("Creating Bitter 2D quarter geometry")
 
-    from math import pi, cos, sin
-
     theta = pi / 2
     if Bitter.tierod:
         tierod = Bitter.tierod
@@ -109,11 +104,14 @@ def gmsh2D_ids(Bitter: Bitter.Bitter, AirData: tuple, debug: bool = False) -> tu
         tierods.append(tierod_id)
         tnames.append("tierod_0")
 
-        for n in range(1, ntierod):
-            if n * theta_t + angle <= theta or n * theta_t + angle >= 2 * pi:  # - theta / 2.0
-                res = gmsh.model.occ.copy([(2, tierod_id)])
-                # print(f"res={res}")
-                _id = res[0][1]
+        valid_n = [
+            n
+            for n in range(1, ntierod)
+            if n * theta_t + angle <= theta or n * theta_t + angle >= 2 * pi  # - theta / 2.0
+        ]
+        if valid_n:
+            res = gmsh.model.occ.copy([(2, tierod_id)] * len(valid_n))
+            for n, (_, _id) in zip(valid_n, res):
                 gmsh.model.occ.rotate([(2, _id)], 0, 0, 0, 0, 0, 1, n * theta_t)
                 tierods.append(_id)
                 tnames.append(f"tierod_{n}")
@@ -153,21 +151,20 @@ def gmsh2D_ids(Bitter: Bitter.Bitter, AirData: tuple, debug: bool = False) -> tu
                 holes.append(slit_id)
                 _names.append(f"slit{j+1}_0")
 
-            for n in range(1, nslits):
-                if n * theta_s + angle <= theta or n * theta_s + angle >= 2 * pi:  # - theta / 2.0
-                    if (
-                        Bitter.tierod
-                        and slit.r == tierod.r
-                        and n * theta_s + angle in tierod_thetas
-                    ):
-                        logger.debug("skip slit")
-                    else:
-                        res = gmsh.model.occ.copy([(2, slit_id)])
-                        # print(f"res={res}")
-                        _id = res[0][1]
-                        gmsh.model.occ.rotate([(2, _id)], 0, 0, 0, 0, 0, 1, n * theta_s)
-                        holes.append(_id)
-                        _names.append(f"slit{j+1}_{n}")
+            # select kept positions first, skipping those occupied by a tierod
+            on_tierod = Bitter.tierod and slit.r == tierod.r
+            valid_n = [
+                n
+                for n in range(1, nslits)
+                if (n * theta_s + angle <= theta or n * theta_s + angle >= 2 * pi)  # - theta / 2.0
+                and not (on_tierod and n * theta_s + angle in tierod_thetas)
+            ]
+            if valid_n:
+                res = gmsh.model.occ.copy([(2, slit_id)] * len(valid_n))
+                for n, (_, _id) in zip(valid_n, res):
+                    gmsh.model.occ.rotate([(2, _id)], 0, 0, 0, 0, 0, 1, n * theta_s)
+                    holes.append(_id)
+                    _names.append(f"slit{j+1}_{n}")
 
             names.append(_names)
 
@@ -240,12 +237,7 @@ def gmsh2D_ids(Bitter: Bitter.Bitter, AirData: tuple, debug: bool = False) -> tu
         _ids = create_bcgroup(cad[0][0][1], tierods[i], tnames[i])
         tierod_ids.append(_ids)
 
-    for hole in holes:
-        gmsh.model.occ.remove([(2, hole)], recursive=True)
-
-    for tierod in tierods:
-        gmsh.model.occ.remove([(2, tierod)], recursive=True)
-
+    gmsh.model.occ.remove([(2, _id) for _id in holes + tierods], recursive=True)
     gmsh.model.occ.synchronize()
 
     # for tierod in tierod_ids:
@@ -268,7 +260,7 @@ def gmsh2D_ids(Bitter: Bitter.Bitter, AirData: tuple, debug: bool = False) -> tu
         eps,
         1,
     )
-    candidate_rint_ids = [tag[1] for tag in candidate_rint]
+    candidate_rint_ids = {tag[1] for tag in candidate_rint}
     logger.debug(
         f"candidate_rint={candidate_rint} xmin={xmin} ymin={ymin} xmax={xmax}, ymax={ymax}"
     )
@@ -285,7 +277,7 @@ def gmsh2D_ids(Bitter: Bitter.Bitter, AirData: tuple, debug: bool = False) -> tu
         eps,
         1,
     )
-    candidate_rext_ids = [tag[1] for tag in candidate_rext]
+    candidate_rext_ids = {tag[1] for tag in candidate_rext}
     logger.debug(
         f"candidate_rext={candidate_rext} xmin={xmin} ymin={ymin} xmax={xmax}, ymax={ymax}"
     )
@@ -302,7 +294,7 @@ def gmsh2D_ids(Bitter: Bitter.Bitter, AirData: tuple, debug: bool = False) -> tu
         eps,
         1,
     )
-    candidate_V0_ids = [tag[1] for tag in candidate_V0]
+    candidate_V0_ids = {tag[1] for tag in candidate_V0}
     logger.debug(f"candidate_V0={candidate_V0} xmin={xmin} ymin={ymin} xmax={xmax}, ymax={ymax}")
     xmin = Bitter.r[0] * cos(theta) - eps
     ymin = Bitter.r[0] * sin(theta) - eps
@@ -317,10 +309,11 @@ def gmsh2D_ids(Bitter: Bitter.Bitter, AirData: tuple, debug: bool = False) -> tu
         eps,
         1,
     )
-    candidate_V1_ids = [tag[1] for tag in candidate_V1]
+    candidate_V1_ids = {tag[1] for tag in candidate_V1}
     logger.debug(f"candidate_V1={candidate_V1} xmin={xmin} ymin={ymin} xmax={xmax}, ymax={ymax}")
 
-    _ids = flatten(hole_ids) + flatten(tierod_ids)
+    # set for O(1) membership tests over all curves
+    _ids = set(flatten(hole_ids) + flatten(tierod_ids))
     logger.debug(f"_ids={_ids}")
     vEntities = gmsh.model.getEntities(1)
     rint_ids = []
@@ -382,6 +375,7 @@ def main():
     parser.add_argument("--mesh", help="activate mesh", action="store_true")
     add_algo2d_arg(parser, get_allowed_algo())
     add_scaling_arg(parser)
+    add_threads_arg(parser)
     parser.add_argument("--lc", help="specify mesh size", type=float, default="10")
     add_show_arg(parser)
     add_common_args(parser)
@@ -419,6 +413,8 @@ def main():
     if args.mesh:
         logger.info(f"create Axi Gmsh mesh ({args.algo2d})")
         gmsh.option.setNumber("Mesh.Algorithm", MeshAlgo2D[args.algo2d])
+        if args.threads:
+            set_threads(args.threads)
 
         # scaling
         unit = 1
@@ -432,45 +428,37 @@ def main():
         dfields = []
         nfield = 0
 
-        # Rint/Rext
-        for bc in result[1]:
-            gmsh.model.mesh.field.add("Distance", nfield)
-            gmsh.model.mesh.field.setNumbers(nfield, "CurvesList", [bc])
-            gmsh.model.mesh.field.setNumbers(nfield, "Sampling", [100])
-            nfield += 1
+        # one Distance/Threshold pair per group of curves:
+        # Min over per-curve Thresholds equals one Threshold on the distance to all curves
 
-            # Field 2: Threshold that dictates the mesh size of the background field
+        # Rint/Rext
+        if result[1]:
+            nfield = threshold_field(
+                nfield,
+                list(result[1]),
+                args.lc / 10.0 * unit,
+                args.lc * unit,
+                10 * unit,
+                12.5 * unit,
+            )
             logger.debug(f"Field[Thresold] for Rint/Rext: {nfield}")
-            gmsh.model.mesh.field.add("Threshold", nfield)
-            gmsh.model.mesh.field.setNumber(nfield, "IField", nfield - 1)
-            gmsh.model.mesh.field.setNumber(nfield, "LcMin", args.lc / 10.0 * unit)
-            gmsh.model.mesh.field.setNumber(nfield, "LcMax", args.lc * unit)
-            gmsh.model.mesh.field.setNumber(nfield, "DistMin", 10 * unit)
-            gmsh.model.mesh.field.setNumber(nfield, "DistMax", 12.5 * unit)
-            gmsh.model.mesh.field.setNumber(nfield, "StopAtDistMax", True)
             dfields.append(nfield)
             nfield += 1
 
         # Tierod
-        if Object.tierod:
+        if Object.tierod and result[3]:
             r_tierod = min(0.5, Object.tierod.r)
-            for bc in result[3]:
-                gmsh.model.mesh.field.add("Distance", nfield)
-                gmsh.model.mesh.field.setNumbers(nfield, "CurvesList", [bc])
-                gmsh.model.mesh.field.setNumbers(nfield, "Sampling", [100])
-                nfield += 1
-
-                # Field 2: Threshold that dictates the mesh size of the background field
-                logger.debug(f"Field[Thresold] for tierods: {nfield}")
-                gmsh.model.mesh.field.add("Threshold", nfield)
-                gmsh.model.mesh.field.setNumber(nfield, "IField", nfield - 1)
-                gmsh.model.mesh.field.setNumber(nfield, "LcMin", args.lc / 20.0 * unit)
-                gmsh.model.mesh.field.setNumber(nfield, "LcMax", args.lc * unit)
-                gmsh.model.mesh.field.setNumber(nfield, "DistMin", r_tierod * unit)
-                gmsh.model.mesh.field.setNumber(nfield, "DistMax", 1.1 * r_tierod * unit)
-                gmsh.model.mesh.field.setNumber(nfield, "StopAtDistMax", True)
-                dfields.append(nfield)
-                nfield += 1
+            nfield = threshold_field(
+                nfield,
+                list(result[3]),
+                args.lc / 20.0 * unit,
+                args.lc * unit,
+                r_tierod * unit,
+                1.1 * r_tierod * unit,
+            )
+            logger.debug(f"Field[Thresold] for tierods: {nfield}")
+            dfields.append(nfield)
+            nfield += 1
 
         # Cooling holes
         lst = []
@@ -478,31 +466,27 @@ def main():
         if Object.coolingslits:
             lst = [slit.dh for slit in Object.coolingslits]
             r_holes = min(2, sum(lst) / len(lst))
-        for bc in result[2]:
-            gmsh.model.mesh.field.add("Distance", nfield)
-            gmsh.model.mesh.field.setNumbers(nfield, "CurvesList", [bc])
-            gmsh.model.mesh.field.setNumbers(nfield, "Sampling", [100])
-            nfield += 1
-
-            # Field 2: Threshold that dictates the mesh size of the background field
+        if result[2]:
+            nfield = threshold_field(
+                nfield,
+                list(result[2]),
+                args.lc / 40.0 * unit,
+                args.lc * unit,
+                r_holes * unit,
+                1.02 * r_holes * unit,
+            )
             logger.debug(f"Field[Thresold] for cooling holes: {nfield}")
-            gmsh.model.mesh.field.add("Threshold", nfield)
-            gmsh.model.mesh.field.setNumber(nfield, "IField", nfield - 1)
-            gmsh.model.mesh.field.setNumber(nfield, "LcMin", args.lc / 40.0 * unit)
-            gmsh.model.mesh.field.setNumber(nfield, "LcMax", args.lc * unit)
-            gmsh.model.mesh.field.setNumber(nfield, "DistMin", r_holes * unit)
-            gmsh.model.mesh.field.setNumber(nfield, "DistMax", 1.02 * r_holes * unit)
-            gmsh.model.mesh.field.setNumber(nfield, "StopAtDistMax", True)
             dfields.append(nfield)
             nfield += 1
 
         # Let's use the minimum of all the fields as the mesh size field:
-        gmsh.model.mesh.field.add("Min", nfield)
-        gmsh.model.mesh.field.setNumbers(nfield, "FieldsList", dfields)  # dfields
-        logger.debug(f"Field[Min] = {nfield}, Min=[{dfields[0]},...,{dfields[-1]}]")
+        if dfields:
+            gmsh.model.mesh.field.add("Min", nfield)
+            gmsh.model.mesh.field.setNumbers(nfield, "FieldsList", dfields)  # dfields
+            logger.debug(f"Field[Min] = {nfield}, Min=[{dfields[0]},...,{dfields[-1]}]")
 
-        logger.info(f"Apply background mesh {nfield}")
-        gmsh.model.mesh.field.setAsBackgroundMesh(nfield)
+            logger.info(f"Apply background mesh {nfield}")
+            gmsh.model.mesh.field.setAsBackgroundMesh(nfield)
 
         gmsh.model.mesh.generate(2)
 
@@ -28,6 +28,14 @@ def get_algo(name: str):
     return MeshAlgo2D[name]
 
 
+def set_threads(nthreads: int):
+    """
+    let gmsh use nthreads threads, including for 2D meshing of several surfaces
+    """
+    gmsh.option.setNumber("General.NumThreads", nthreads)
+    gmsh.option.setNumber("Mesh.MaxNumThreads2D", nthreads)
+
+
 def gmsh_msh(
     algo: str,
     meshdata: MeshAxiData,
@@ -109,7 +117,7 @@ def gmsh_msh(
                 ov += _ov
 
                 lc_data[namGroup]["box"].append((xmin, ymin, zmin, xmax, ymax, zmax))
-                lc_data[namGroup]["pts"] += [tag for (dimtag, tag) in ov]
+                lc_data[namGroup]["pts"] += [tag for (dimtag, tag) in _ov]
                 lc_data[namGroup]["lc"] = lc
 
         if dimGroup == 1:
@@ -140,7 +148,8 @@ def gmsh_msh(
     print("Physical Surfaces")
     for key, values in reversed(lc_data.items()):
         print(f"lc_data[{key}]: lc={values['lc']}")
-        gmsh.model.mesh.setSize([(0, tag) for tag in values["pts"]], values["lc"])
+        # setSize is batched: one call per physical surface with unique points
+        gmsh.model.mesh.setSize([(0, tag) for tag in dict.fromkeys(values["pts"])], values["lc"])
 
     """
     print("Physical Lines:")
@@ -1,7 +1,10 @@
 #!/usr/bin/env python3
 # -*- coding:utf-8 -*-
 
+from typing import Optional
+
 import gmsh
+import numpy as np
 from ..logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -43,31 +46,50 @@ def minmax(box: list[float], eps: float):
     return (rmin, rmax, zmin, zmax)
 
 
-def create_bcs(name: str, box: list, dim: int = 1, eps: float = 1.0e-6):
+def create_bcs(
+    name: str,
+    box: list,
+    dim: int = 1,
+    eps: float = 1.0e-6,
+    sync: bool = True,
+    cache: Optional[dict] = None,
+):
     """
     create BCs for name
 
     name:
-    box:
+    box: boundingbox [rmin, zmin, rmax, zmax] or a list of boundingboxes
+         (either nested lists or a numpy array)
     dim:
     eps:
+    sync: synchronize occ model before looking for entities
+    cache: entities already found, keyed by tolerance box (shared within a batch)
     """
 
     print(f"create BCs for {name}", flush=True)
 
-    gmsh.model.occ.synchronize()
+    if sync:
+        gmsh.model.occ.synchronize()
+    if cache is None:
+        cache = {}
+
+    def entities(item):
+        key = (*minmax(item, eps), dim)
+        if key not in cache:
+            (rmin, rmax, zmin, zmax, _) = key
+            cache[key] = gmsh.model.getEntitiesInBoundingBox(rmin, zmin, 0, rmax, zmax, 0, dim)
+        return cache[key]
+
     ov = []
-    if isinstance(box[0], float) or isinstance(box[0], int):
-        (rmin, rmax, zmin, zmax) = minmax(box, eps)
-        ov += gmsh.model.getEntitiesInBoundingBox(rmin, zmin, 0, rmax, zmax, 0, dim)
+    if np.ndim(box) == 1:
+        ov += entities(box)
     else:
         for item in box:
             # print(f'create_bcs: item={item}')
-            (rmin, rmax, zmin, zmax) = minmax(item, eps)
-            _ov = gmsh.model.getEntitiesInBoundingBox(rmin, zmin, 0, rmax, zmax, 0, dim)
+            _ov = entities(item)
             if len(_ov) == 0:
                 print(f"create_bs: name={name}, item={item} no surface detected")
-                print(f"minmax: {(rmin, rmax, zmin, zmax)}")
+                print(f"minmax: {minmax(item, eps)}")
             # print(f'create_bcs: _ov={_ov}')
             ov += _ov
             # print(f'create_bcs: ov={ov}')
@@ -79,3 +101,23 @@ def create_bcs(name: str, box: list, dim: int = 1, eps: float = 1.0e-6):
     if len(ov) == 0:
         print(f"create_bs: name={name}, box={box} no surface detected")
     return ps
+
+
+def create_bcs_batch(bcs_defs, dim: int = 1, eps: float = 1.0e-6) -> dict:
+    """
+    create BCs for each (name, box) in bcs_defs
+
+    bcs_defs: dict or list of (name, box)
+    dim:
+    eps:
+
+    synchronize and set Geometry.OCCBoundsUseStl only once for all BCs,
+    and query gmsh only once per distinct bounding box
+    """
+
+    gmsh.option.setNumber("Geometry.OCCBoundsUseStl", 1)
+    gmsh.model.occ.synchronize()
+
+    cache: dict[tuple, list[tuple[int, int]]] = {}
+    items = bcs_defs.items() if isinstance(bcs_defs, dict) else bcs_defs
+    return {name: create_bcs(name, box, dim, eps, sync=False, cache=cache) for (name, box) in items}
@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+import gmsh
+
+
+def threshold_field(
+    nfield: int, curves: list, lcmin: float, lcmax: float, distmin: float, distmax: float
+) -> int:
+    """
+    add a Distance field to all curves and the Threshold field built on it
+
+    returns the tag of the Threshold field (nfield + 1)
+    """
+    gmsh.model.mesh.field.add("Distance", nfield)
+    gmsh.model.mesh.field.setNumbers(nfield, "CurvesList", curves)
+    gmsh.model.mesh.field.setNumbers(nfield, "Sampling", [100])
+
+    gmsh.model.mesh.field.add("Threshold", nfield + 1)
+    gmsh.model.mesh.field.setNumber(nfield + 1, "IField", nfield)
+    gmsh.model.mesh.field.setNumber(nfield + 1, "LcMin", lcmin)
+    gmsh.model.mesh.field.setNumber(nfield + 1, "LcMax", lcmax)
+    gmsh.model.mesh.field.setNumber(nfield + 1, "DistMin", distmin)
+    gmsh.model.mesh.field.setNumber(nfield + 1, "DistMax", distmax)
+    gmsh.model.mesh.field.setNumber(nfield + 1, "StopAtDistMax", True)
+    return nfield + 1
@@ -1,4 +1,5 @@
 import logging
+from collections import Counter
 
 logger = logging.getLogger(__name__)
 
@@ -7,13 +8,22 @@ def flatten(S: list) -> list:
     """
     flatten list of list
     """
-    from pandas.core.common import flatten as pd_flatten
 
-    flattened = list(pd_flatten(S))
+    # iterative depth-first walk: one iterator per nesting level
+    flattened = []
+    stack = [iter(S)]
+    while stack:
+        for item in stack[-1]:
+            if hasattr(item, "__iter__") and not isinstance(item, (str, bytes)):
+                stack.append(iter(item))
+                break
+            flattened.append(item)
+        else:
+            stack.pop()
 
     # Check for duplicates
     if len(flattened) != len(set(flattened)):
-        duplicates = [item for item in set(flattened) if flattened.count(item) > 1]
+        duplicates = [item for item, count in Counter(flattened).items() if count > 1]
         logger.warning(f"Duplicates found in flattened list: {duplicates}")
 
     return flattened
@@ -0,0 +1,10 @@
+from functools import lru_cache
+from importlib import import_module
+
+
+@lru_cache(maxsize=None)
+def load_module(name: str):
+    """
+    import a python_magnetgmsh submodule, resolved once per name
+    """
+    return import_module(name, package="python_magnetgmsh")
@@ -0,0 +1,68 @@
+"""
+tests for axi Bitters geometry
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+gmsh = pytest.importorskip("gmsh")
+pytest.importorskip("python_magnetgeo")
+
+from python_magnetgmsh.axi import Bitters  # noqa: E402
+
+
+class FakeBitter(SimpleNamespace):
+    """
+    stands for a Bitter magnet: a single rectangle in (r, z)
+    """
+
+
+class FakeBitterModule:
+    """
+    records the AirData each magnet is built with
+    """
+
+    def __init__(self):
+        self.airdata = []
+
+    def gmsh_ids(self, magnet, AirData, thickslit=False, debug=False):
+        self.airdata.append(AirData)
+        _id = gmsh.model.occ.addRectangle(
+            magnet.r[0], magnet.z[0], 0, magnet.r[1] - magnet.r[0], magnet.z[1] - magnet.z[0]
+        )
+        return ([[_id]], [], ())
+
+
+@pytest.fixture
+def model():
+    gmsh.initialize()
+    gmsh.model.add("test_bitters")
+    yield
+    gmsh.finalize()
+
+
+def test_gmsh_ids_builds_a_single_air(model, monkeypatch):
+    fake = FakeBitterModule()
+    monkeypatch.setitem(Bitters.import_dict, FakeBitter, "fake")
+    monkeypatch.setattr(Bitters, "load_module", lambda name: fake)
+
+    magnets = [
+        FakeBitter(name="B1", r=[10.0, 20.0], z=[-10.0, 10.0]),
+        FakeBitter(name="B2", r=[30.0, 40.0], z=[-10.0, 10.0]),
+    ]
+    bitters = SimpleNamespace(
+        name="Bitters",
+        magnets=magnets,
+        boundingBox=lambda: ([10.0, 40.0], [-10.0, 10.0]),
+    )
+
+    (gmsh_ids, crack_ids, Air_data) = Bitters.gmsh_ids(bitters, (1.2, 1.2))
+
+    # magnets are built without air: Bitters adds one air domain for the whole set
+    assert fake.airdata == [(), ()]
+    assert len(gmsh_ids) == 2
+    assert Air_data
+
+    # 2 magnets and the air surrounding them
+    assert len(gmsh.model.getEntities(2)) == 3